@@ -1,9 +1,11 @@
 from . import utils as utils
 from . import types as types
 from .asset import *
+from .asset_cache import *
 from .category import *
 from .channel import *
 from .client import *
+from .codec import *
 from .embed import *
 from .emoji import *
 from .enums import *
@@ -12,6 +14,7 @@ from .file import *
 from .flags import *
 from .invite import *
 from .member import *
+from .member_store import *
 from .message import *
 from .messageable import *
 from .permissions import *
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import mimetypes
-from typing import TYPE_CHECKING
+import os
+import shutil
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Union
+
+import aiohttp
 
 from .enums import AssetType
+from .errors import DownloadError
 from .utils import Ulid
 
 if TYPE_CHECKING:
@@ -66,19 +72,110 @@ class Asset(Ulid):
         base_url = self.state.api_info["features"]["autumn"]["url"]
         self.url: str = f"{base_url}/{self.tag}/{self.id}"
 
+    @property
+    def _cache_key(self) -> Optional[tuple[str, str]]:
+        return (self.tag, self.id)
+
     async def read(self) -> bytes:
-        """Reads the files content into bytes"""
-        return await self.state.http.request_file(self.url)
+        """Reads the files content into bytes, using the client's asset cache if it has one"""
+        return await self.state.http.request_file(self.url, self._cache_key)
 
-    async def save(self, fp: IOBase) -> None:
-        """Reads the files content and saves it to a file
+    async def iter_chunks(self, chunk_size: int = 2**16, *, offset: int = 0) -> AsyncIterator[bytes]:
+        """Streams the files content in chunks without holding the whole file in memory
+
+        If the download is interrupted it is resumed from where it stopped with a range request.
 
         Parameters
         -----------
-        fp: IOBase
-            The file to write to
+        chunk_size: :class:`int`
+            The maximum size of each chunk in bytes
+        offset: :class:`int`
+            How many bytes into the file to start from
+
+        Raises
+        -------
+        :class:`DownloadError`
+            The amount of bytes downloaded did not match the size of the asset
         """
-        fp.write(await self.read())
+        received = offset
+        attempts = 0
+
+        while True:
+            try:
+                async for chunk in self.state.http.iter_file(self.url, chunk_size=chunk_size, offset=received):
+                    received += len(chunk)
+                    yield chunk
+
+            except (aiohttp.ClientPayloadError, aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                attempts += 1
+
+                if attempts > self.state.http.max_retries:
+                    raise
+
+                continue
+
+            break
+
+        if self.size and received != self.size:
+            raise DownloadError(f"expected {self.size} bytes but received {received}")
+
+    @staticmethod
+    def _copy_cached(cached: str, fp: Union[str, os.PathLike[str], IOBase], chunk_size: int) -> None:
+        if isinstance(fp, (str, os.PathLike)):
+            shutil.copyfile(cached, fp)
+        else:
+            with open(cached, "rb") as source:
+                shutil.copyfileobj(source, fp, chunk_size)  # type: ignore
+
+    async def save(self, fp: Union[str, os.PathLike[str], IOBase], *, chunk_size: int = 2**16) -> None:
+        """Streams the files content into a file
+
+        When given a path the file is first downloaded to ``<path>.part``, if that file already exists from an earlier
+        interrupted download the download is resumed from the end of it. If the client has an asset cache the file is
+        copied from it when cached, and files saved to a path are added to it.
+
+        Parameters
+        -----------
+        fp: Union[:class:`str`, :class:`os.PathLike`, IOBase]
+            The path or file to write to
+        chunk_size: :class:`int`
+            The maximum size of each chunk written in bytes
+        """
+        cache = self.state.http.asset_cache
+        key = self._cache_key
+
+        if cache is not None and key is not None and (cached := await cache.get_path(*key)):
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._copy_cached, cached, fp, chunk_size)
+                return
+            except FileNotFoundError:  # evicted between the lookup and opening it
+                pass
+
+        if not isinstance(fp, (str, os.PathLike)):
+            async for chunk in self.iter_chunks(chunk_size):
+                fp.write(chunk)
+
+            return
+
+        path = os.fspath(fp)
+        partial = f"{path}.part"
+
+        try:
+            offset = os.path.getsize(partial)
+        except OSError:
+            offset = 0
+
+        if self.size and offset > self.size:
+            offset = 0
+
+        with open(partial, "ab" if offset else "wb") as f:
+            async for chunk in self.iter_chunks(chunk_size, offset=offset):
+                f.write(chunk)
+
+        os.replace(partial, path)
+
+        if cache is not None and key is not None:
+            await cache.put_file(*key, path)
 
 class PartialAsset(Asset):
     """Partial asset for when we get limited data about the asset
@@ -100,6 +197,7 @@ class PartialAsset(Asset):
     type: :class:`AssetType`
         The type of asset it is, this always be ``AssetType.file``
     """
+    __slots__ = ()
 
     def __init__(self, url: str, state: State):
         self.state: State = state
@@ -111,3 +209,7 @@ class PartialAsset(Asset):
         self.content_type: str | None = mimetypes.guess_extension(url)
         self.type: AssetType = AssetType.file
         self.url: str = url
+
+    @property
+    def _cache_key(self) -> Optional[tuple[str, str]]:
+        return None
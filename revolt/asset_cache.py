@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Optional, Union
+
+__all__ = ("AssetCache",)
+
+class AssetCache:
+    """An on disk cache for asset contents, with a small in memory tier for frequently used assets
+
+    Assets are keyed by their tag and id, neither of which change, so cached assets never need to be revalidated.
+    Both tiers evict the least recently used assets once they go over their size budget.
+
+    Parameters
+    -----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The directory to store assets in, this is created if it does not exist and existing assets in it are reused.
+        Temporary files left in it by interrupted writes are removed, so the directory should not be shared by caches running at the same time
+    max_size: :class:`int`
+        The maximum total size in bytes of the assets stored on disk
+    memory_size: :class:`int`
+        The maximum total size in bytes of the assets kept in memory, ``0`` disables the memory tier
+
+    Attributes
+    -----------
+    hits: :class:`int`
+        The amount of lookups which found the asset in either tier
+    memory_hits: :class:`int`
+        The amount of lookups which found the asset in memory
+    misses: :class:`int`
+        The amount of lookups which did not find the asset
+    """
+    __slots__ = ("path", "max_size", "memory_size", "hits", "memory_hits", "misses", "_files", "_disk_used", "_memory", "_memory_used")
+
+    def __init__(self, path: Union[str, os.PathLike[str]], *, max_size: int = 512 * 1024 * 1024, memory_size: int = 16 * 1024 * 1024):
+        self.path: str = os.fspath(path)
+        self.max_size: int = max_size
+        self.memory_size: int = memory_size
+
+        self.hits: int = 0
+        self.memory_hits: int = 0
+        self.misses: int = 0
+
+        self._files: OrderedDict[str, int] = OrderedDict()
+        self._disk_used: int = 0
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_used: int = 0
+
+        os.makedirs(self.path, exist_ok=True)
+
+        entries: list[os.DirEntry[str]] = []
+
+        for entry in os.scandir(self.path):
+            if not entry.is_file():
+                continue
+
+            if entry.name.endswith(".tmp"):
+                # left behind by a write which was interrupted before its rename
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+            else:
+                entries.append(entry)
+
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            size = entry.stat().st_size
+            self._files[entry.name] = size
+            self._disk_used += size
+
+        self._evict_disk()
+
+    @staticmethod
+    def _key(tag: str, id: str) -> str:
+        return f"{tag}_{id}"
+
+    def _file_path(self, key: str) -> str:
+        return os.path.join(self.path, key)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        return self._key(*item) in self._files
+
+    def _evict_disk(self) -> None:
+        while self._disk_used > self.max_size and self._files:
+            key, size = self._files.popitem(last=False)
+            self._disk_used -= size
+
+            try:
+                os.remove(self._file_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_size:
+            return
+
+        if (old := self._memory.pop(key, None)) is not None:
+            self._memory_used -= len(old)
+
+        self._memory[key] = data
+        self._memory_used += len(data)
+
+        while self._memory_used > self.memory_size:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+
+    def _read(self, key: str) -> bytes:
+        path = self._file_path(key)
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        os.utime(path)
+        return data
+
+    def _temp_path(self) -> str:
+        # every write gets its own temporary file so concurrent puts of the same asset dont write into each other before the rename
+        with tempfile.NamedTemporaryFile(dir=self.path, suffix=".tmp", delete=False) as f:
+            return f.name
+
+    def _write(self, key: str, data: bytes) -> None:
+        temp = self._temp_path()
+
+        try:
+            with open(temp, "wb") as f:
+                f.write(data)
+
+            os.replace(temp, self._file_path(key))
+        except BaseException:
+            os.remove(temp)
+            raise
+
+    def _copy(self, source: str, destination: str) -> None:
+        temp = self._temp_path()
+
+        try:
+            shutil.copyfile(source, temp)
+            os.replace(temp, destination)
+        except BaseException:
+            os.remove(temp)
+            raise
+
+    def _found(self, key: str) -> bool:
+        if key in self._files:
+            self._files.move_to_end(key)
+            self.hits += 1
+            return True
+
+        self.misses += 1
+        return False
+
+    async def get(self, tag: str, id: str) -> Optional[bytes]:
+        """Gets the contents of an asset from the cache
+
+        Parameters
+        -----------
+        tag: :class:`str`
+            The tag of the asset
+        id: :class:`str`
+            The id of the asset
+
+        Returns
+        --------
+        Optional[:class:`bytes`]
+            The contents of the asset, or ``None`` if it is not cached
+        """
+        key = self._key(tag, id)
+
+        if (data := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+
+            if key in self._files:
+                self._files.move_to_end(key)
+
+            self.hits += 1
+            self.memory_hits += 1
+            return data
+
+        if not self._found(key):
+            return None
+
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(None, self._read, key)
+        except FileNotFoundError:
+            self._disk_used -= self._files.pop(key, 0)
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+        self._remember(key, data)
+        return data
+
+    async def get_path(self, tag: str, id: str) -> Optional[str]:
+        """Gets the path of a cached asset on disk, this does not load the asset into memory
+
+        Parameters
+        -----------
+        tag: :class:`str`
+            The tag of the asset
+        id: :class:`str`
+            The id of the asset
+
+        Returns
+        --------
+        Optional[:class:`str`]
+            The path of the asset, or ``None`` if it is not cached
+        """
+        key = self._key(tag, id)
+
+        if not self._found(key):
+            return None
+
+        path = self._file_path(key)
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, os.utime, path)
+        except FileNotFoundError:
+            self._disk_used -= self._files.pop(key, 0)
+            self.hits -= 1
+            self.misses += 1
+            return None
+
+        return path
+
+    async def put(self, tag: str, id: str, data: bytes) -> None:
+        """Stores the contents of an asset in the cache
+
+        Parameters
+        -----------
+        tag: :class:`str`
+            The tag of the asset
+        id: :class:`str`
+            The id of the asset
+        data: :class:`bytes`
+            The contents of the asset
+        """
+        if len(data) > self.max_size:
+            return
+
+        key = self._key(tag, id)
+        await asyncio.get_running_loop().run_in_executor(None, self._write, key, data)
+        self._store(key, len(data))
+        self._remember(key, data)
+
+    async def put_file(self, tag: str, id: str, path: Union[str, os.PathLike[str]]) -> None:
+        """Stores an asset which has already been saved to disk in the cache by copying it
+
+        Parameters
+        -----------
+        tag: :class:`str`
+            The tag of the asset
+        id: :class:`str`
+            The id of the asset
+        path: Union[:class:`str`, :class:`os.PathLike`]
+            The path of the saved asset
+        """
+        size = os.path.getsize(path)
+
+        if size > self.max_size:
+            return
+
+        key = self._key(tag, id)
+        await asyncio.get_running_loop().run_in_executor(None, self._copy, os.fspath(path), self._file_path(key))
+        self._store(key, size)
+
+    def _store(self, key: str, size: int) -> None:
+        self._disk_used += size - self._files.pop(key, 0)
+        self._files[key] = size
+        self._evict_disk()
+
+    def clear(self) -> None:
+        """Removes every asset from the cache"""
+        for key in self._files:
+            try:
+                os.remove(self._file_path(key))
+            except FileNotFoundError:
+                pass
+
+        self._files.clear()
+        self._memory.clear()
+        self._disk_used = 0
+        self._memory_used = 0
@@ -23,6 +23,7 @@ class Category(Ulid):
     channel_ids: list[:class:`str`]
         The ids of channels that are inside the category
     """
+    __slots__ = ("state", "name", "id", "channel_ids")
 
     def __init__(self, data: CategoryPayload, state: State):
         self.state: State = state
@@ -6,9 +6,11 @@ from .asset import Asset
 from .enums import ChannelType
 from .messageable import Messageable
 from .permissions import Permissions, PermissionsOverwrite
+from .permissions_calculator import calculate_bulk_permissions, permission_masks
 from .utils import Missing, Ulid
 
 if TYPE_CHECKING:
+    from .member import Member
     from .message import Message
     from .role import Role
     from .server import Server
@@ -117,6 +119,8 @@ class Channel(Ulid):
 
 class SavedMessageChannel(Channel, Messageable):
     """The Saved Message Channel"""
+    __slots__ = ()
+
     def __init__(self, data: SavedMessagesPayload, state: State):
         super().__init__(data, state)
 
@@ -263,6 +267,8 @@ class ServerChannel(Channel):
     default_permissions: :class:`ChannelPermissions`
         The default permissions for all users in the text channel
     """
+    __slots__ = ("name", "description", "nsfw", "active", "default_permissions", "permissions", "icon")
+
     def __init__(self, data: ServerChannelPayload, state: State):
         super().__init__(data, state)
 
@@ -309,6 +315,35 @@ class ServerChannel(Channel):
 
         await self.state.http.set_guild_channel_role_permissions(self.id, role.id, allow.value, deny.value)
 
+    def compute_member_permissions(self) -> dict[str, Permissions]:
+        """Calculates the permissions of every cached member of the server in this channel at once, this is much faster than calling :meth:`Member.get_channel_permissions` for each member
+
+        Returns
+        --------
+        dict[:class:`str`, :class:`Permissions`]
+            The permissions of each member by their id
+        """
+        return {member_id: Permissions._from_value(value) for member_id, value in calculate_bulk_permissions(self.server._members.values(), self).items()}
+
+    def members_with_permission(self, **permissions: bool) -> list[Member]:
+        """Gets every cached member of the server with the specified permissions in this channel
+
+        Parameters
+        -----------
+        permissions: :class:`bool`
+            The permissions to check, this also accepted `False` if you need to check if the member does not have the permission
+
+        Returns
+        --------
+        list[:class:`Member`]
+            The members with the permissions
+        """
+        server = self.server
+        required, forbidden = permission_masks(permissions)
+        values = calculate_bulk_permissions(server._members.values(), self)
+
+        return [server._members[member_id] for member_id, value in values.items() if value & required == required and not value & forbidden]
+
     def _update(self, *, name: Optional[str] = None, description: Optional[str] = None, icon: Optional[FilePayload] = None, nsfw: Optional[bool] = None, active: Optional[bool] = None, role_permissions: Optional[dict[str, OverwritePayload]] = None, default_permissions: Optional[OverwritePayload] = None):
         if name is not None:
             self.name = name
@@ -360,7 +395,7 @@ class TextChannel(ServerChannel, Messageable, EditableChannel):
         The description of the channel, if any
     """
 
-    __slots__ = ("name", "description", "last_message_id", "default_permissions", "icon", "overwrites")
+    __slots__ = ("last_message_id",)
 
     def __init__(self, data: TextChannelPayload, state: State):
         super().__init__(data, state)
@@ -406,6 +441,7 @@ class VoiceChannel(ServerChannel, EditableChannel):
     description: Optional[:class:`str`]
         The description of the channel, if any
     """
+    __slots__ = ()
 
 def channel_factory(data: ChannelPayload, state: State) -> Union[DMChannel, GroupDMChannel, SavedMessageChannel, TextChannel, VoiceChannel]:
     if data["channel_type"] == "SavedMessages":
@@ -7,6 +7,7 @@ from typing_extensions import ParamSpec
 
 import aiohttp
 
+from .codec import Codec, CodecName, default_gateway_codec, default_json_codec, get_codec
 from .errors import RevoltError
 from .channel import (DMChannel, GroupDMChannel, SavedMessageChannel,
                       TextChannel, VoiceChannel, channel_factory)
@@ -17,15 +18,12 @@ from .state import State
 from .utils import Missing, Ulid
 from .websocket import WebsocketHandler
 from .emoji import Emoji
+from .enums import MemberCachePolicy
 from .server import Server
 from .user import User
 
-try:
-    import ujson as json
-except ImportError:
-    import json
-
 if TYPE_CHECKING:
+    from .asset_cache import AssetCache
     from .channel import Channel
     from .file import File
     from .types import ApiInfo
@@ -52,14 +50,58 @@ class Client:
         The api url for the revolt instance you are connecting to, by default it uses the offical instance hosted at revolt.chat
     max_messages: :class:`int`
         The max amount of messages stored in the cache, by default this is 5k
+    max_queue_size: :class:`int`
+        The max amount of received events waiting to be handled per server or channel, reading from the websocket pauses while a queue is full, by default this is 1000
+    member_fetch_concurrency: :class:`int`
+        The max amount of servers to fetch the members of at once, by default this is 10
+    member_fetch_timeout: Optional[:class:`float`]
+        Time in seconds to wait for a server's members before giving up on them, by default this is 30 seconds
+    member_cache: :class:`MemberCachePolicy`
+        Which members are cached, ``full`` fetches every server's members on startup, ``lazy`` fetches and caches members when they are first seen as a message author, ``none`` caches no members. By default this is ``full``. With ``lazy`` or ``none``, :meth:`User.get_permissions` cannot tell which users share a server with the client, so every user is treated as if they do while the client is in any server
+    ingest_chunk_size: :class:`int`
+        The max amount of objects built from the ready payload or a server's member list before yielding to the event loop, by default this is 1000
+    ingest_time_budget: :class:`float`
+        The max time in seconds spent building objects from the ready payload or a server's member list before yielding to the event loop, by default this is 0.02 seconds
+    max_uploads: :class:`int`
+        The max amount of files being uploaded at once, by default this is 8
+    max_uploads_per_request: :class:`int`
+        The max amount of files being uploaded at once for a single message or edit, by default this is 4
+    asset_cache: Optional[:class:`AssetCache`]
+        The cache used when reading and saving assets, by default assets are not cached
+    columnar_members: :class:`bool`
+        Whether to store each server's members in columns instead of one object per member, this uses less memory for large servers but member objects are built on every lookup. By default this is ``False``
+    codec: Optional[Union[:class:`str`, :class:`Codec`]]
+        The json codec used for http requests, one of ``"json"``, ``"ujson"``, ``"orjson"`` or ``"msgspec"``. By default this is the fastest one installed
+    gateway_codec: Optional[Union[:class:`str`, :class:`Codec`]]
+        The codec used for the websocket, this can also be ``"msgpack"`` or ``"msgspec_msgpack"``. By default this is msgpack if it is installed otherwise the http codec
+    typed_payloads: :class:`bool`
+        Whether websocket events are decoded into msgspec structs instead of dicts, which skips building a dict for every user, member, server and message. This needs msgspec and falls back to dicts if it is not installed,
+        it is only used when ``gateway_codec`` is not given, pass a :class:`MsgspecCodec` or :class:`MsgspecMsgpackCodec` with ``typed=True`` to pick the format yourself. By default this is ``False``
     """
 
-    def __init__(self, session: aiohttp.ClientSession, token: str, *, api_url: str = "https://api.revolt.chat", max_messages: int = 5000, bot: bool = True):
+    def __init__(self, session: aiohttp.ClientSession, token: str, *, api_url: str = "https://api.revolt.chat", max_messages: int = 5000, bot: bool = True, max_queue_size: int = 1000, member_fetch_concurrency: int = 10, member_fetch_timeout: Optional[float] = 30, member_cache: MemberCachePolicy = MemberCachePolicy.full, ingest_chunk_size: int = 1000, ingest_time_budget: float = 0.02, max_uploads: int = 8, max_uploads_per_request: int = 4, asset_cache: Optional[AssetCache] = None, columnar_members: bool = False, codec: Optional[Union[CodecName, Codec]] = None, gateway_codec: Optional[Union[CodecName, Codec]] = None, typed_payloads: bool = False):
         self.session: aiohttp.ClientSession = session
         self.token: str = token
         self.api_url: str = api_url
         self.max_messages: int = max_messages
         self.bot: bool = bot
+        self.max_queue_size: int = max_queue_size
+        self.member_fetch_concurrency: int = member_fetch_concurrency
+        self.member_fetch_timeout: Optional[float] = member_fetch_timeout
+        self.member_cache: MemberCachePolicy = member_cache
+        self.ingest_chunk_size: int = ingest_chunk_size
+        self.ingest_time_budget: float = ingest_time_budget
+        self.max_uploads: int = max_uploads
+        self.max_uploads_per_request: int = max_uploads_per_request
+        self.asset_cache: Optional[AssetCache] = asset_cache
+        self.columnar_members: bool = columnar_members
+
+        self.codec: Codec = get_codec(codec) if codec is not None else default_json_codec()
+
+        if self.codec.format != "json":
+            raise RevoltError(f"The {self.codec.name} codec can not be used for http requests, they must be json")
+
+        self.gateway_codec: Codec = get_codec(gateway_codec) if gateway_codec is not None else default_gateway_codec(self.codec, typed=typed_payloads)
 
         self.api_info: ApiInfo
         self.http: HttpClient
@@ -100,21 +142,21 @@ class Client:
 
     async def get_api_info(self) -> ApiInfo:
         async with self.session.get(self.api_url) as resp:
-            text = await resp.text()
+            body = await resp.read()
 
             try:
-                return json.loads(text)
-            except:
-                raise RevoltError(f"Cant fetch api info:\n{text}")
+                return self.codec.loads(body)
+            except ValueError:
+                raise RevoltError(f"Cant fetch api info:\n{body.decode(errors='replace')}") from None
 
     async def start(self, *, reconnect: bool = True) -> None:
         """Starts the client"""
         api_info = await self.get_api_info()
 
         self.api_info = api_info
-        self.http = HttpClient(self.session, self.token, self.api_url, self.api_info, self.bot)
-        self.state = State(self.http, api_info, self.max_messages)
-        self.websocket = WebsocketHandler(self.session, self.token, api_info["ws"], self.dispatch, self.state)
+        self.http = HttpClient(self.session, self.token, self.api_url, self.api_info, self.bot, max_uploads=self.max_uploads, max_uploads_per_request=self.max_uploads_per_request, asset_cache=self.asset_cache, codec=self.codec)
+        self.state = State(self.http, api_info, self.max_messages, self.member_fetch_concurrency, self.member_fetch_timeout, self.member_cache, self.ingest_chunk_size, self.ingest_time_budget, self.columnar_members)
+        self.websocket = WebsocketHandler(self.session, self.token, api_info["ws"], self.dispatch, self.state, self.max_queue_size, self.gateway_codec)
 
         await self.websocket.start(reconnect)
 
@@ -368,11 +410,7 @@ class Client:
         LookupError
             This raises if the message is not found in the cache
         """
-        for message in self.state.messages:
-            if message.id == message_id:
-                return message
-
-        raise LookupError
+        return self.state.get_message(message_id)
 
     async def edit_self(self, **kwargs: Any) -> None:
         """Edits the client's own user
@@ -516,6 +554,9 @@ class Client:
     async def on_server_join(self, server: revolt.Server) -> None:
         pass
 
+    async def on_server_ready(self, server: revolt.Server) -> None:
+        pass
+
     async def on_member_update(self, before: revolt.Member, after: revolt.Member) -> None:
         pass
 
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, Optional, Union
+
+from .errors import RevoltError
+
+use_ujson: bool
+use_orjson: bool
+use_msgspec: bool
+use_msgpack: bool
+
+try:
+    import ujson
+    use_ujson = True
+except ImportError:
+    use_ujson = False
+
+try:
+    import orjson
+    use_orjson = True
+except ImportError:
+    use_orjson = False
+
+try:
+    import msgspec
+    use_msgspec = True
+except ImportError:
+    use_msgspec = False
+
+try:
+    import msgpack
+    use_msgpack = True
+except ImportError:
+    use_msgpack = False
+
+if TYPE_CHECKING:
+    # each library is only used once its flag is checked, so the checker can treat them as always imported
+    import msgpack
+    import msgspec
+    import orjson
+    import ujson
+
+__all__ = ("Codec", "JSONCodec", "UJSONCodec", "OrjsonCodec", "MsgspecCodec", "MsgspecMsgpackCodec", "MsgpackCodec", "get_codec", "default_json_codec", "default_gateway_codec")
+
+logger = logging.getLogger("revolt")
+
+CodecName = Literal["json", "ujson", "orjson", "msgspec", "msgspec_msgpack", "msgpack"]
+
+class Codec(ABC):
+    """Abstract base class for the encoders and decoders used for http requests and the websocket
+
+    Attributes
+    -----------
+    name: :class:`str`
+        The name of the codec
+    format: :class:`str`
+        The format the codec produces, either ``"json"`` or ``"msgpack"``
+    typed: :class:`bool`
+        Whether :meth:`loads_event` decodes gateway events into the structs in ``revolt.structs`` instead of dicts
+    """
+    __slots__ = ()
+
+    name: ClassVar[str]
+    format: ClassVar[Literal["json", "msgpack"]]
+    typed: bool = False
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> Union[bytes, str]:
+        """Encodes a payload"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decodes a payload, this raises :class:`ValueError` if the data is invalid"""
+        raise NotImplementedError
+
+    def loads_event(self, data: Union[bytes, str]) -> Any:
+        """Decodes a gateway event, this is the same as :meth:`loads` unless the codec is typed"""
+        return self.loads(data)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r}>"
+
+class JSONCodec(Codec):
+    """JSON codec using the standard library"""
+    __slots__ = ()
+
+    name = "json"
+    format = "json"
+
+    def dumps(self, obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+class UJSONCodec(Codec):
+    """JSON codec using ujson"""
+    __slots__ = ()
+
+    name = "ujson"
+    format = "json"
+
+    def __init__(self):
+        if not use_ujson:
+            raise RevoltError("ujson is not installed")
+
+    def dumps(self, obj: Any) -> str:
+        return ujson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+class OrjsonCodec(Codec):
+    """JSON codec using orjson"""
+    __slots__ = ()
+
+    name = "orjson"
+    format = "json"
+
+    def __init__(self):
+        if not use_orjson:
+            raise RevoltError("orjson is not installed")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+class _MsgspecCodec(Codec):
+    __slots__ = ("typed", "_encoder", "_decoder", "_event_decoder")
+
+    def __init__(self, *, typed: bool = False):
+        if not use_msgspec:
+            raise RevoltError("msgspec is not installed")
+
+        self.typed: bool = typed
+        self._encoder, self._decoder = self._make_encoder(), self._make_decoder()
+        self._event_decoder: Any = None
+
+        if typed:
+            from .structs import EventPayloads
+
+            self._event_decoder = self._make_decoder(EventPayloads)
+
+    @abstractmethod
+    def _make_encoder(self) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _make_decoder(self, payload_type: Any = Any) -> Any:
+        raise NotImplementedError
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+    def loads_event(self, data: Union[bytes, str]) -> Any:
+        if self._event_decoder is None:
+            return self.loads(data)
+
+        try:
+            return self._event_decoder.decode(data)
+        except msgspec.ValidationError as e:
+            # events without a struct or which dont match theirs are still handled, just as dicts
+            logger.debug("Decoding event as a dict: %s", e)
+            return self.loads(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from None
+
+class MsgspecCodec(_MsgspecCodec):
+    """JSON codec using msgspec
+
+    Parameters
+    -----------
+    typed: :class:`bool`
+        Whether gateway events are decoded into the structs in ``revolt.structs`` instead of dicts, by default this is ``False``
+    """
+    __slots__ = ()
+
+    name = "msgspec"
+    format = "json"
+
+    def _make_encoder(self) -> Any:
+        return msgspec.json.Encoder()
+
+    def _make_decoder(self, payload_type: Any = Any) -> Any:
+        return msgspec.json.Decoder(payload_type)
+
+class MsgspecMsgpackCodec(_MsgspecCodec):
+    """Msgpack codec using msgspec, like :class:`MsgpackCodec` this can only be used for the websocket
+
+    Parameters
+    -----------
+    typed: :class:`bool`
+        Whether gateway events are decoded into the structs in ``revolt.structs`` instead of dicts, by default this is ``False``
+    """
+    __slots__ = ()
+
+    name = "msgspec_msgpack"
+    format = "msgpack"
+
+    def _make_encoder(self) -> Any:
+        return msgspec.msgpack.Encoder()
+
+    def _make_decoder(self, payload_type: Any = Any) -> Any:
+        return msgspec.msgpack.Decoder(payload_type)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, str):
+            raise ValueError("msgpack payloads must be bytes")
+
+        return super().loads(data)
+
+    def loads_event(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, str):
+            raise ValueError("msgpack payloads must be bytes")
+
+        return super().loads_event(data)
+
+class MsgpackCodec(Codec):
+    """Msgpack codec using msgpack, this can only be used for the websocket as the http api only speaks json"""
+    __slots__ = ()
+
+    name = "msgpack"
+    format = "msgpack"
+
+    def __init__(self):
+        if not use_msgpack:
+            raise RevoltError("msgpack is not installed")
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if isinstance(data, str):
+            raise ValueError("msgpack payloads must be bytes")
+
+        try:
+            return msgpack.unpackb(data)
+        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+            raise ValueError(str(e)) from None
+
+CODECS: dict[str, type[Codec]] = {codec.name: codec for codec in (JSONCodec, UJSONCodec, OrjsonCodec, MsgspecCodec, MsgspecMsgpackCodec, MsgpackCodec)}
+
+def get_codec(codec: Union[CodecName, Codec]) -> Codec:
+    """Gets a codec by its name, codec instances are returned as is
+
+    Parameters
+    -----------
+    codec: Union[:class:`str`, :class:`Codec`]
+        The name of the codec, one of ``"json"``, ``"ujson"``, ``"orjson"``, ``"msgspec"``, ``"msgspec_msgpack"`` or ``"msgpack"``
+
+    Returns
+    --------
+    :class:`Codec`
+        The codec
+
+    Raises
+    -------
+    :class:`RevoltError`
+        The codec does not exist or its library is not installed
+    """
+    if isinstance(codec, Codec):
+        return codec
+
+    try:
+        return CODECS[codec]()
+    except KeyError:
+        raise RevoltError(f"Unknown codec {codec!r}") from None
+
+def default_json_codec() -> Codec:
+    """Returns the fastest installed json codec, in order orjson, msgspec, ujson then the standard library"""
+    if use_orjson:
+        return OrjsonCodec()
+    elif use_msgspec:
+        return MsgspecCodec()
+    elif use_ujson:
+        return UJSONCodec()
+    else:
+        return JSONCodec()
+
+def default_gateway_codec(json_codec: Optional[Codec] = None, *, typed: bool = False) -> Codec:
+    """Returns the codec for the websocket, this is msgpack if it is installed otherwise the json codec
+
+    Parameters
+    -----------
+    json_codec: Optional[:class:`Codec`]
+        The codec used when msgpack is not installed, by default this is :func:`default_json_codec`
+    typed: :class:`bool`
+        Whether events should be decoded into structs, this gives a typed msgspec msgpack codec if msgspec is installed and falls back to dicts otherwise
+    """
+    if typed:
+        if use_msgspec:
+            return MsgspecMsgpackCodec(typed=True)
+
+        logger.warning("msgspec is not installed, gateway events will be decoded as dicts")
+
+    if use_msgpack:
+        return MsgpackCodec()
+
+    return json_codec or default_json_codec()
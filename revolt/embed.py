@@ -21,6 +21,8 @@ if TYPE_CHECKING:
 __all__ = ("Embed", "WebsiteEmbed", "ImageEmbed", "TextEmbed", "NoneEmbed", "to_embed", "SendableEmbed")
 
 class WebsiteEmbed:
+    __slots__ = ("url", "special", "title", "description", "image", "video", "site_name", "icon_url", "colour")
+
     type = EmbedType.website
 
     def __init__(self, embed: WebsiteEmbedPayload):
@@ -35,6 +37,8 @@ class WebsiteEmbed:
         self.colour: str | None = embed.get("colour")
 
 class ImageEmbed:
+    __slots__ = ("url", "width", "height", "size")
+
     type: EmbedType = EmbedType.image
 
     def __init__(self, image: ImageEmbedPayload):
@@ -44,6 +48,8 @@ class ImageEmbed:
         self.size: str = image.get("size")
 
 class TextEmbed:
+    __slots__ = ("icon_url", "url", "title", "description", "media", "colour")
+
     type: EmbedType = EmbedType.text
 
     def __init__(self, embed: TextEmbedPayload, state: State):
@@ -62,6 +68,8 @@ class TextEmbed:
         self.colour: str | None = embed.get("colour")
 
 class NoneEmbed:
+    __slots__ = ()
+
     type: EmbedType = EmbedType.none
 
 Embed = Union[WebsiteEmbed, ImageEmbed, TextEmbed, NoneEmbed]
@@ -108,6 +116,8 @@ class SendableEmbed:
     url: Optional[:class:`str`]
         URL for hyperlinking the embed's title
     """
+    __slots__ = ("title", "description", "media", "icon_url", "colour", "url")
+
     def __init__(self, **attrs: Unpack[EmbedParameters]):
         self.title: Optional[str] = None
         self.description: Optional[str] = None
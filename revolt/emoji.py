@@ -29,6 +29,8 @@ class Emoji(Ulid):
     server_id: Optional[:class:`str`]
         The server id this emoji belongs to, if any
     """
+    __slots__ = ("state", "id", "author_id", "name", "animated", "nsfw", "server_id")
+
     def __init__(self, payload: EmojiPayload, state: State):
         self.state: State = state
 
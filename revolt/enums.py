@@ -14,7 +14,8 @@ __all__ = (
     "RelationshipType",
     "AssetType",
     "SortType",
-    "EmbedType"
+    "EmbedType",
+    "MemberCachePolicy"
 )
 
 class ChannelType(enum.Enum):
@@ -57,3 +58,8 @@ class EmbedType(enum.Enum):
     image = "Image"
     text = "Text"
     none = "None"
+
+class MemberCachePolicy(enum.Enum):
+    full = "full"
+    lazy = "lazy"
+    none = "none"
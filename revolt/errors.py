@@ -5,6 +5,7 @@ __all__ = (
     "FeatureDisabled",
     "AutumnDisabled",
     "Forbidden",
+    "DownloadError",
 )
 
 class RevoltError(Exception):
@@ -24,3 +25,6 @@ class AutumnDisabled(FeatureDisabled):
 
 class Forbidden(HTTPError):
     "Missing permissions"
+
+class DownloadError(HTTPError):
+    "The downloaded file did not match the size of the asset"
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Coroutine, Union, cast
+from typing import Any, Callable, Coroutine, Optional, Union, cast
 from typing_extensions import TypeVar
 
 import revolt
+from revolt.permissions_calculator import calculate_permission_value, permission_masks
 
 from .command import Command
 from .context import Context
@@ -67,28 +68,79 @@ def is_server_owner() -> Callable[[T], T]:
 
     return inner
 
+def _missing_permissions(permissions: dict[str, bool], value: int, required: int, forbidden: int) -> MissingPermissionsError:
+    missing = required & ~value
+    unwanted = forbidden & value
+    failed = {name: expected for name, expected in permissions.items() if revolt.Permissions.FLAG_VALUES[name] & (missing | unwanted)}
+
+    return MissingPermissionsError(failed, revolt.Permissions._from_value(missing), revolt.Permissions._from_value(unwanted))
+
+async def _get_member(context: Context[ClientT_D]) -> Optional[revolt.Member]:
+    author = context.author
+
+    if isinstance(author, revolt.Member):
+        return author
+
+    if not context.server_id:
+        return None
+
+    # the author of a server message is only a user when the member cache policy did not cache them
+
+    try:
+        return await context.state.fetch_member(context.server_id, author.id)
+    except revolt.HTTPError:
+        return None
+
 def has_permissions(**permissions: bool) -> Callable[[T], T]:
+    """A command check for limiting the command to members with the specified permissions in the server
+
+    The permissions are compiled into masks once when the check is created.
+
+    Parameters
+    -----------
+    permissions: :class:`bool`
+        The permissions to check, this also accepted `False` if the member must not have the permission
+    """
+    required, forbidden = permission_masks(permissions)
+
     @check
-    def inner(context: Context[ClientT_D]) -> bool:
-        author = context.author
+    async def inner(context: Context[ClientT_D]) -> bool:
+        if (author := await _get_member(context)) is None:
+            raise MissingPermissionsError(permissions, revolt.Permissions._from_value(required))
+
+        value = calculate_permission_value(author, author.server)
 
-        if not author.has_permissions(**permissions):
-            raise MissingPermissionsError(permissions)
+        if (value & required) != required or value & forbidden:
+            raise _missing_permissions(permissions, value, required, forbidden)
 
         return True
 
     return inner
 
 def has_channel_permissions(**permissions: bool) -> Callable[[T], T]:
-    @check
-    def inner(context: Context[ClientT_D]) -> bool:
-        author = context.author
+    """A command check for limiting the command to members with the specified permissions in the channel
 
-        if not isinstance(author, revolt.Member):
+    The permissions are compiled into masks once when the check is created.
+
+    Parameters
+    -----------
+    permissions: :class:`bool`
+        The permissions to check, this also accepted `False` if the member must not have the permission
+    """
+    required, forbidden = permission_masks(permissions)
+
+    @check
+    async def inner(context: Context[ClientT_D]) -> bool:
+        if not context.server_id:
             raise ServerOnly
 
-        if not author.has_channel_permissions(context.channel, **permissions):
-            raise MissingPermissionsError(permissions)
+        if (author := await _get_member(context)) is None:
+            raise MissingPermissionsError(permissions, revolt.Permissions._from_value(required))
+
+        value = calculate_permission_value(author, context.channel)
+
+        if (value & required) != required or value & forbidden:
+            raise _missing_permissions(permissions, value, required, forbidden)
 
         return True
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING, Annotated, TypeVar
 
-from revolt import Category, Channel, Member, User, utils
+from revolt import Category, Channel, HTTPError, Member, MemberCachePolicy, User, utils
 
 from .context import Context
 from .errors import (BadBoolArgument, CategoryConverterError,
@@ -82,7 +82,7 @@ def user_converter(arg: str, context: Context[ClientT]) -> User:
         except LookupError:
             raise UserConverterError(arg)
 
-def member_converter(arg: str, context: Context[ClientT]) -> Member:
+async def member_converter(arg: str, context: Context[ClientT]) -> Member:
     if not context.server_id:
         raise ServerOnly
 
@@ -91,25 +91,35 @@ def member_converter(arg: str, context: Context[ClientT]) -> Member:
 
     try:
         return context.server.get_member(arg)
-    except KeyError:
-        try:
-            parts = arg.split("#")
+    except LookupError:
+        pass
 
-            if len(parts) == 1:
-                return (
-                    utils.get(context.server.members, original_name=arg)
-                    or utils.get(context.server.members, display_name=arg)
-                )
-            elif len(parts) == 2:
-                return (
-                    utils.get(context.server.members, original_name=parts[0], discriminator=parts[1])
-                    or utils.get(context.server.members, display_name=parts[0], discriminator=parts[1])
-                )
-            else:
-                raise LookupError
+    # members may not be cached depending on the member cache policy
 
-        except LookupError:
-            raise MemberConverterError(arg)
+    if context.state.member_cache is not MemberCachePolicy.full and len(arg) == 26:
+        try:
+            return await context.state.fetch_member(context.server.id, arg)
+        except HTTPError:
+            pass
+
+    try:
+        parts = arg.split("#")
+
+        if len(parts) == 1:
+            return (
+                utils.get(context.server.members, original_name=arg)
+                or utils.get(context.server.members, display_name=arg)
+            )
+        elif len(parts) == 2:
+            return (
+                utils.get(context.server.members, original_name=parts[0], discriminator=parts[1])
+                or utils.get(context.server.members, display_name=parts[0], discriminator=parts[1])
+            )
+        else:
+            raise LookupError
+
+    except LookupError:
+        raise MemberConverterError(arg)
 
 def int_converter(arg: str, context: Context[ClientT]) -> int:
     return int(arg)
@@ -1,4 +1,6 @@
-from revolt import RevoltError
+from typing import Optional
+
+from revolt import Permissions, RevoltError
 
 __all__ = (
     "CommandError",
@@ -8,6 +10,7 @@ __all__ = (
     "NotBotOwner",
     "NotServerOwner",
     "ServerOnly",
+    "MissingPermissionsError",
     "ConverterError",
     "InvalidLiteralArgument",
     "BadBoolArgument",
@@ -56,11 +59,17 @@ class MissingPermissionsError(CheckError):
     Attributes
     -----------
     permissions: :class:`dict[str, bool]`
-        The permissions which the user did not have
+        The permissions which the user did not have, mapped to the value the check required
+    missing: :class:`Permissions`
+        The permissions the check required which the user does not have
+    unwanted: :class:`Permissions`
+        The permissions the check required the user to not have which they do have
     """
 
-    def __init__(self, permissions: dict[str, bool]):
+    def __init__(self, permissions: dict[str, bool], missing: Optional[Permissions] = None, unwanted: Optional[Permissions] = None):
         self.permissions = permissions
+        self.missing = missing or Permissions()
+        self.unwanted = unwanted or Permissions()
 
 class ConverterError(CommandError):
     """Base class for all converter errors"""
@@ -1,34 +1,68 @@
 from __future__ import annotations
 
 import io
-from typing import Optional, Union, cast
+import mmap
+import os
+from typing import Any, AsyncIterable, Optional, Union, cast
+
+import aiohttp
 
 __all__ = ("File",)
 
+CHUNK_SIZE = 2**16
+
+class _MappedFilePayload(aiohttp.payload.Payload):
+    """Streams a memory mapped file in fixed size chunks, closing the map and the file afterwards."""
+
+    def __init__(self, value: mmap.mmap, file: io.BufferedIOBase, offset: int, **kwargs: Any):
+        super().__init__(value, **kwargs)
+        self._file = file
+        self._offset = offset
+        self._size = len(value) - offset
+
+    async def write(self, writer: Any) -> None:
+        try:
+            for start in range(self._offset, len(self._value), CHUNK_SIZE):
+                await writer.write(self._value[start:start + CHUNK_SIZE])
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        """Closes the map and the file, this is safe to call more than once"""
+        self._value.close()
+        self._file.close()
+
 class File:
     """Respresents a file about to be uploaded to revolt
 
+    Files are streamed to revolt in chunks rather than being read into memory in full, paths and file objects are sent with a known size,
+    async iterables are sent with chunked encoding.
+
     Parameters
     -----------
-    file: Union[str, bytes]
-        The name of the file or the content of the file in bytes, text files will be need to be encoded
+    file: Union[str, os.PathLike, bytes, io.IOBase, AsyncIterable[bytes]]
+        The path of the file, the content of the file in bytes, a binary file object, or an async iterable of byte chunks, text files will be need to be encoded
     filename: Optional[str]
         The filename of the file when being uploaded, this will default to the name of the file if one exists
     spoiler: bool
         Determines if the file will be a spoiler, this prefexes the filename with `SPOILER_`
+    use_mmap: bool
+        Whether to memory map files on disk instead of reading them through a buffer, this only applies to paths and files opened with :func:`open`
     """
-    __slots__ = ("f", "spoiler", "filename")
+    __slots__ = ("f", "spoiler", "filename", "use_mmap")
 
-    def __init__(self, file: Union[str, bytes], *, filename: Optional[str] = None, spoiler: bool = False):
-        self.f: io.BufferedIOBase
+    def __init__(self, file: Union[str, os.PathLike[str], bytes, io.IOBase, AsyncIterable[bytes]], *, filename: Optional[str] = None, spoiler: bool = False, use_mmap: bool = False):
+        self.f: Union[io.IOBase, AsyncIterable[bytes]]
 
-        if isinstance(file, str):
+        if isinstance(file, (str, os.PathLike)):
             self.f = open(file, "rb")
-        else:
+        elif isinstance(file, (bytes, bytearray, memoryview)):
             self.f = io.BytesIO(file)
+        else:
+            self.f = file
 
-        if filename is None and isinstance(file, str):
-            filename = cast(Optional[str], self.f.name)
+        if filename is None and isinstance(name := getattr(self.f, "name", None), (str, bytes)):
+            filename = os.fsdecode(name)
 
         self.spoiler: bool = spoiler or (bool(filename) and filename.startswith("SPOILER_"))
 
@@ -36,3 +70,23 @@ class File:
             filename = f"SPOILER_{filename}"
 
         self.filename: str | None = filename
+        self.use_mmap: bool = use_mmap
+
+    def _to_payload(self) -> aiohttp.payload.Payload:
+        """Returns the payload to add to a :class:`aiohttp.FormData`, aiohttp streams file objects and async iterables itself.
+
+        The payload always has a filename, without one aiohttp would urlencode the form instead of sending it as multipart.
+        """
+        # aiohttp names unnamed file objects after the form field, do the same for every source
+        filename = self.filename or "file"
+        f = self.f
+
+        if self.use_mmap and isinstance(f, io.BufferedReader):
+            reader = cast(io.BufferedIOBase, f)  # narrowing leaves the reader's generic parameter unknown
+            offset = reader.tell()
+
+            if os.fstat(reader.fileno()).st_size > offset:
+                mapped = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+                return _MappedFilePayload(mapped, reader, offset, filename=filename)
+
+        return aiohttp.payload.get_payload(f, filename=filename)
@@ -26,22 +26,27 @@ class Flag:
         if instance is None:
             return self
 
-        return instance._check_flag(self.flag)
+        return (instance.value & self.flag) == self.flag
 
     def __set__(self, instance: Flags, value: bool) -> None:
         instance._set_flag(self.flag, value)
 
 class Flags:
+    __slots__ = ("value",)
+
     FLAG_NAMES: list[str]
+    FLAG_VALUES: dict[str, int]
 
     def __init_subclass__(cls) -> None:
         cls.FLAG_NAMES = []
+        cls.FLAG_VALUES = {}
 
         for name in dir(cls):
             value = getattr(cls, name)
 
             if isinstance(value, Flag):
                 cls.FLAG_NAMES.append(name)
+                cls.FLAG_VALUES[name] = value.flag
 
     def __init__(self, value: int = 0, **flags: bool):
         self.value = value
@@ -55,6 +60,70 @@ class Flags:
         self.value = value
         return self
 
+    @classmethod
+    def mask(cls, **flags: bool) -> int:
+        """Compiles flags into an int mask, only the flags set to ``True`` are included
+
+        Compile masks once and reuse them with :meth:`has_all` and :meth:`has_any` to avoid building new objects for every check.
+
+        Parameters
+        -----------
+        flags: :class:`bool`
+            The flags to include
+
+        Returns
+        --------
+        :class:`int`
+            The mask
+
+        Raises
+        -------
+        :class:`TypeError`
+            A flag does not exist
+        """
+        mask = 0
+
+        for name, value in flags.items():
+            try:
+                flag = cls.FLAG_VALUES[name]
+            except KeyError:
+                raise TypeError(f"{cls.__name__} has no flag named {name!r}") from None
+
+            if value:
+                mask |= flag
+
+        return mask
+
+    def has_all(self, mask: int) -> bool:
+        """Checks if every flag in the mask is set
+
+        Parameters
+        -----------
+        mask: :class:`int`
+            The mask from :meth:`mask`
+
+        Returns
+        --------
+        :class:`bool`
+            Whether all of the flags are set
+        """
+        return (self.value & mask) == mask
+
+    def has_any(self, mask: int) -> bool:
+        """Checks if any flag in the mask is set
+
+        Parameters
+        -----------
+        mask: :class:`int`
+            The mask from :meth:`mask`
+
+        Returns
+        --------
+        :class:`bool`
+            Whether any of the flags are set
+        """
+        return (self.value & mask) != 0
+
     def _check_flag(self, flag: int) -> bool:
         return (self.value & flag) == flag
 
@@ -104,6 +173,7 @@ class Flags:
 
 class UserBadges(Flags):
     """Contains all user badges"""
+    __slots__ = ()
 
     @Flag
     def developer():
@@ -1,23 +1,24 @@
 from __future__ import annotations
 
-from typing import (TYPE_CHECKING, Any, Coroutine, Literal, Optional, TypeVar,
+import asyncio
+import logging
+import re
+import time
+from typing import (TYPE_CHECKING, Any, AsyncIterator, Coroutine, Literal, Mapping, Optional, TypeVar,
                     Union, overload)
 
 import aiohttp
 import ulid
 
 
+from .codec import Codec, default_json_codec
 from .errors import Forbidden, HTTPError, ServerError
-from .file import File
-
-try:
-    import ujson as _json
-except ImportError:
-    import json as _json
+from .file import File, _MappedFilePayload
 
 if TYPE_CHECKING:
     import aiohttp
 
+    from .asset_cache import AssetCache
     from .enums import SortType
     from .file import File
     from .types import Autumn as AutumnPayload
@@ -31,20 +32,130 @@ if TYPE_CHECKING:
     from .types import (Server, ServerBans, TextChannel, UserProfile, VoiceChannel, Member, Invite, ApiInfo, Channel, SavedMessages,
                         DMChannel, EmojiParent, GetServerMembers, GroupDMChannel, MessageReplyPayload, MessageWithUserData, PartialInvite, Role)
 
-__all__ = ("HttpClient",)
+__all__ = ("HttpClient", "RateLimitBucket")
+
+logger: logging.Logger = logging.getLogger("revolt")
 
 T = TypeVar("T")
 Request = Coroutine[Any, Any, T]
+AssetTag = Literal["attachments", "avatars", "backgrounds", "icons", "banners", "emojis"]
+
+# ids are ulids, replacing them gives the route template which is used to pick the rate limit bucket before revolt tells us its name
+ulid_regex: re.Pattern[str] = re.compile("[0-9A-HJKMNP-TV-Z]{26}")
+
+class RateLimitBucket:
+    """Tracks the remaining requests of a rate limit bucket, requests wait in :meth:`RateLimitBucket.acquire` while it is exhausted
+
+    Attributes
+    -----------
+    limit: :class:`int`
+        The amount of requests allowed per reset
+    remaining: :class:`int`
+        The amount of requests left until the bucket resets
+    reset_at: :class:`float`
+        The :func:`time.monotonic` time the bucket resets at
+    merged_into: Optional[:class:`RateLimitBucket`]
+        The bucket shared with other routes which replaced this one, once revolt named it
+    """
+    __slots__ = ("lock", "limit", "remaining", "reset_at", "window", "learned", "merged_into")
+
+    def __init__(self):
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.limit: int = 1
+        self.remaining: int = 1
+        self.reset_at: float = 0.0
+        self.window: float = 0.0
+        self.learned: asyncio.Event = asyncio.Event()
+        self.merged_into: Optional[RateLimitBucket] = None
+
+    async def acquire(self) -> RateLimitBucket:
+        """Waits until a request can be sent, returning the bucket the request was counted against"""
+        # the lock makes requests wait in the order they arrived while the bucket is exhausted
+        async with self.lock:
+            if self.remaining <= 0:
+                # the limits are unknown until the first response arrives so only one request is sent before then
+                await self.learned.wait()
+
+            if self.merged_into is None:
+                if self.remaining <= 0:
+                    if (delay := self.reset_at - time.monotonic()) > 0:
+                        logger.debug("Rate limit bucket exhausted, waiting %.3fs", delay)
+                        await asyncio.sleep(delay)
+
+                    # the new reset time is unknown until a response arrives, so assume it is as long as the last one
+                    self.remaining = self.limit
+                    self.reset_at = time.monotonic() + self.window
+
+                self.remaining -= 1
+                return self
+
+        # the route shares its bucket with other routes, so requests which were already waiting here queue on that one instead
+        return await self.merged_into.acquire()
+
+    def merge(self, bucket: RateLimitBucket) -> None:
+        self.merged_into = bucket
+        self.learned.set()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        if (limit := headers.get("X-RateLimit-Limit")) is not None:
+            self.limit = int(limit)
+
+        if (remaining := headers.get("X-RateLimit-Remaining")) is not None:
+            self.remaining = int(remaining)
+
+        if (reset_after := headers.get("X-RateLimit-Reset-After")) is not None:
+            reset_after_seconds = int(reset_after) / 1000
+
+            self.reset_at = time.monotonic() + reset_after_seconds
+            self.window = max(self.window, reset_after_seconds)
+
+        self.learned.set()
+
+    def exhaust(self, retry_after: float) -> None:
+        self.remaining = 0
+        self.reset_at = time.monotonic() + retry_after
 
 class HttpClient:
-    __slots__ = ("session", "token", "api_url", "api_info", "auth_header")
+    __slots__ = ("session", "token", "api_url", "api_info", "auth_header", "max_retries", "buckets", "route_buckets", "upload_semaphore", "max_uploads_per_request", "asset_cache", "codec")
 
-    def __init__(self, session: aiohttp.ClientSession, token: str, api_url: str, api_info: ApiInfo, bot: bool = True):
+    def __init__(self, session: aiohttp.ClientSession, token: str, api_url: str, api_info: ApiInfo, bot: bool = True, max_retries: int = 5, max_uploads: int = 8, max_uploads_per_request: int = 4, asset_cache: Optional[AssetCache] = None, codec: Optional[Codec] = None):
         self.session: aiohttp.ClientSession = session
         self.token: str = token
         self.api_url: str = api_url
         self.api_info: ApiInfo = api_info
         self.auth_header: str = "x-bot-token" if bot else "x-session-token"
+        self.max_retries: int = max_retries
+        self.buckets: dict[str, RateLimitBucket] = {}
+        self.route_buckets: dict[str, str] = {}  # route template -> bucket name sent by revolt
+        self.upload_semaphore: asyncio.Semaphore = asyncio.Semaphore(max_uploads)
+        self.max_uploads_per_request: int = max_uploads_per_request
+        self.asset_cache: Optional[AssetCache] = asset_cache
+        self.codec: Codec = codec or default_json_codec()
+
+    def get_bucket(self, route_key: str) -> RateLimitBucket:
+        bucket_name = self.route_buckets.get(route_key, route_key)
+
+        if (bucket := self.buckets.get(bucket_name)) is None:
+            bucket = self.buckets[bucket_name] = RateLimitBucket()
+
+        return bucket
+
+    def _update_bucket(self, route_key: str, bucket: RateLimitBucket, headers: Mapping[str, str]) -> RateLimitBucket:
+        # routes which share a bucket are merged once revolt tells us the bucket's name
+        if (bucket_name := headers.get("X-RateLimit-Bucket")) is not None and self.route_buckets.get(route_key) != bucket_name:
+            self.route_buckets[route_key] = bucket_name
+
+            if self.buckets.get(route_key) is bucket:
+                del self.buckets[route_key]
+
+            shared = self.buckets.setdefault(bucket_name, bucket)
+
+            if shared is not bucket:
+                bucket.merge(shared)
+                bucket = shared
+
+        bucket.update(headers)
+        return bucket
 
     async def request(self, method: Literal["GET", "POST", "PUT", "DELETE", "PATCH"], route: str, *, json: Optional[dict[str, Any]] = None, nonce: bool = True, params: Optional[dict[str, Any]] = None) -> Any:
         url = f"{self.api_url}{route}"
@@ -62,44 +173,79 @@ class HttpClient:
             if nonce:
                 json["nonce"] = ulid.new().str # type: ignore
 
-            kwargs["data"] = _json.dumps(json)
+            kwargs["data"] = self.codec.dumps(json)
 
         kwargs["headers"] = headers
 
         if params:
             kwargs["params"] = params
 
-        async with self.session.request(method, url, **kwargs) as resp:
-            text = await resp.text()
-            if text:
+        route_key = f"{method} {ulid_regex.sub('{id}', route)}"
+        bucket = self.get_bucket(route_key)
+
+        for _ in range(self.max_retries + 1):
+            bucket = await bucket.acquire()
+
+            try:
+                async with self.session.request(method, url, **kwargs) as resp:
+                    body = await resp.read()
+                    bucket = self._update_bucket(route_key, bucket, resp.headers)
+            finally:
+                # let requests waiting to learn the bucket's limits through even if this request failed
+                bucket.learned.set()
+
+            resp_code = resp.status
+
+            if resp_code == 429:
+                retry_after: float
+
+                try:
+                    retry_after = self.codec.loads(body)["retry_after"] / 1000
+                except (ValueError, KeyError, TypeError):
+                    retry_after = bucket.reset_at - time.monotonic()
+
+                logger.warning("Rate limited on %s, retrying in %.3fs", route_key, retry_after)
+                bucket.exhaust(retry_after)
+                continue
+
+            response: Any
+
+            if body:
                 try:
-                    response = _json.loads(await resp.text())
+                    response = self.codec.loads(body)
                 except ValueError:
-                    raise HTTPError(f"Invalid json response:\n{text}") from None
+                    raise HTTPError(f"Invalid json response:\n{body.decode(errors='replace')}") from None
             else:
-                response = text
+                response = ""
 
-        resp_code = resp.status
+            if 200 <= resp_code <= 300:
+                return response
+            elif resp_code == 401:
+                raise Forbidden("401: Missing Permissions")
+            else:
+                raise HTTPError(resp_code)
 
-        if 200 <= resp_code <= 300:
-            return response
-        elif resp_code == 401:
-            raise Forbidden("401: Missing Permissions")
-        else:
-            raise HTTPError(resp_code)
+        raise HTTPError(429)
 
-    async def upload_file(self, file: File, tag: Literal["attachments", "avatars", "backgrounds", "icons", "banners", "emojis"]) -> AutumnPayload:
+    async def upload_file(self, file: File, tag: AssetTag) -> AutumnPayload:
         url = f"{self.api_info['features']['autumn']['url']}/{tag}"
 
         headers = {
             "User-Agent": "Revolt.py (https://github.com/revoltchat/revolt.py)"
         }
 
-        form = aiohttp.FormData()
-        form.add_field("file", file.f.read(), filename=file.filename)
+        payload = file._to_payload()
+
+        try:
+            form = aiohttp.FormData()
+            form.add_field("file", payload, filename=payload.filename)
 
-        async with self.session.post(url, data=form, headers=headers) as resp:
-            response: AutumnPayload = _json.loads(await resp.text())
+            async with self.upload_semaphore, self.session.post(url, data=form, headers=headers) as resp:
+                response: AutumnPayload = self.codec.loads(await resp.read())
+        finally:
+            # the body is never written if the upload is cancelled or fails before sending it, so the mapped file is released here as well
+            if isinstance(payload, _MappedFilePayload):
+                payload.release()
 
         resp_code = resp.status
 
@@ -110,6 +256,27 @@ class HttpClient:
         else:
             return response
 
+    async def upload_files(self, files: list[tuple[File, AssetTag]]) -> list[AutumnPayload]:
+        """Uploads files concurrently, returning the uploaded files in the same order.
+
+        If an upload fails the others are cancelled.
+        """
+        semaphore = asyncio.Semaphore(self.max_uploads_per_request)
+
+        async def upload(file: File, tag: AssetTag) -> AutumnPayload:
+            async with semaphore:
+                return await self.upload_file(file, tag)
+
+        tasks = [asyncio.ensure_future(upload(file, tag)) for file, tag in files]
+
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+
+            raise
+
     async def send_message(self, channel: str, content: Optional[str], embeds: Optional[list[SendableEmbedPayload]], attachments: Optional[list[File]], replies: Optional[list[MessageReplyPayload]], masquerade: Optional[MasqueradePayload], interactions: Optional[InteractionsPayload]) -> MessagePayload:
         json: dict[str, Any] = {}
 
@@ -120,13 +287,8 @@ class HttpClient:
             json["embeds"] = embeds
 
         if attachments:
-            attachment_ids: list[str] = []
-
-            for attachment in attachments:
-                data = await self.upload_file(attachment, "attachments")
-                attachment_ids.append(data["id"])
-
-            json["attachments"] = attachment_ids
+            uploaded = await self.upload_files([(attachment, "attachments") for attachment in attachments])
+            json["attachments"] = [data["id"] for data in uploaded]
 
         if replies:
             json["replies"] = replies
@@ -268,9 +430,44 @@ class HttpClient:
 
         return self.request("POST", f"/channels/{channel}/search", json=json)
 
-    async def request_file(self, url: str) -> bytes:
+    async def request_file(self, url: str, key: Optional[tuple[str, str]] = None) -> bytes:
+        """Downloads a file, ``key`` is the tag and id of an autumn file and lets the asset cache be used"""
+        cache = self.asset_cache
+
+        if cache is not None and key is not None and (data := await cache.get(*key)) is not None:
+            return data
+
         async with self.session.get(url) as resp:
-            return await resp.content.read()
+            data = await resp.content.read()
+
+        if cache is not None and key is not None and resp.status == 200:
+            await cache.put(*key, data)
+
+        return data
+
+    async def iter_file(self, url: str, *, chunk_size: int = 2**16, offset: int = 0) -> AsyncIterator[bytes]:
+        """Streams a file in chunks, starting ``offset`` bytes in with a Range request."""
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+
+        async with self.session.get(url, headers=headers) as resp:
+            if resp.status == 416:  # the range starts at the end of the file, nothing is left to download
+                return
+
+            if resp.status >= 400:
+                raise HTTPError(resp.status)
+
+            skip = offset if resp.status != 206 else 0  # the server ignored the range and is sending the whole file
+
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if skip:
+                    if len(chunk) <= skip:
+                        skip -= len(chunk)
+                        continue
+
+                    chunk = chunk[skip:]
+                    skip = 0
+
+                yield chunk
 
     def fetch_user(self, user_id: str) -> Request[UserPayload]:
         return self.request("GET", f"/users/{user_id}")
@@ -369,14 +566,24 @@ class HttpClient:
         if remove:
             values["remove"] = remove
 
-        if avatar := values.get("avatar"):
-            asset = await self.upload_file(avatar, "avatars")
-            values["avatar"] = asset["id"]
+        avatar = values.get("avatar")
+        background = profile.get("background") if (profile := values.get("profile")) else None
+
+        uploads: list[tuple[File, AssetTag]] = []
+
+        if avatar:
+            uploads.append((avatar, "avatars"))
+
+        if background:
+            uploads.append((background, "backgrounds"))
+
+        uploaded = iter(await self.upload_files(uploads))
+
+        if avatar:
+            values["avatar"] = next(uploaded)["id"]
 
-        if profile := values.get("profile"):
-            if background := profile.background():
-                asset = await self.upload_file(background, "backgrounds")
-                profile["background"] = asset["id"]
+        if profile and background:
+            profile["background"] = next(uploaded)["id"]
 
         return await self.request("PATCH", "/users/@me", json=values)
 
@@ -418,7 +625,7 @@ class HttpClient:
         return self.request("GET", f"/custom/emoji/{emoji_id}")
 
     async def create_emoji(self, name: str, file: File, nsfw: bool, parent: EmojiParent) -> EmojiPayload:
-        asset = await self.upload_file(file, "emojis")
+        asset = (await self.upload_files([(file, "emojis")]))[0]
 
         return await self.request("PUT", f"/custom/emoji/{asset['id']}", json={"name": name, "parent": parent, "nsfw": nsfw})
 
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import datetime
-from typing import TYPE_CHECKING, Any, Optional
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 
-from .utils import _Missing, Missing, parse_timestamp
+from .utils import EPOCH, MICROSECOND, _Missing, Missing, epoch_to_datetime, parse_epoch
 
-from .asset import Asset
+from .asset import Asset, PartialAsset
 from .permissions import Permissions
-from .permissions_calculator import calculate_permissions
-from .user import User
+from .permissions_calculator import calculate_permission_value, calculate_permissions, permission_masks
+from .user import BaseUser, User
 from .file import File
 
 if TYPE_CHECKING:
@@ -19,58 +20,154 @@ if TYPE_CHECKING:
     from .types import File as FilePayload
     from .types import Member as MemberPayload
     from .role import Role
+    from .structs import Member as MemberStruct
 
-__all__ = ("Member",)
+__all__ = ("Member", "StoredMember")
 
-def flattern_user(member: Member, user: User) -> None:
-    for attr in user.__flattern_attributes__:
-        setattr(member, attr, getattr(user, attr))
+class _UserAttribute:
+    """Reads and writes an attribute of the :class:`User` a member belongs to"""
+    __slots__ = ("name",)
 
-class Member(User):
-    """Represents a member of a server, subclasses :class:`User`
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: Optional[Member], owner: type[Member]) -> Any:
+        if instance is None:
+            return self
+
+        return getattr(instance._user, self.name)
+
+    def __set__(self, instance: Member, value: Any) -> None:
+        setattr(instance._user, self.name, value)
+
+class Member(BaseUser, ABC):
+    """Represents a member of a server, subclasses :class:`BaseUser`
+
+    The user's attributes are read from the :class:`User` the member belongs to, so a member does not carry a copy of the user's storage.
+
+    This is an abstract base, members held by a server are :class:`StoredMember` unless the server uses a :class:`ColumnarMemberStore`.
+    To build a member from its payload use :class:`StoredMember`, which takes the same arguments ``Member`` used to.
 
     Attributes
     -----------
-    nickname: Optional[:class:`str`]
-        The nickname of the member if any
-    roles: list[:class:`Role`]
-        The roles of the member, ordered by the role's rank in decending order
     server: :class:`Server`
         The server the member belongs to
-    guild_avatar: Optional[:class:`Asset`]
-        The member's guild avatar if any
     """
-    __slots__ = ("state", "nickname", "roles", "server", "guild_avatar", "joined_at", "current_timeout")
-
-    def __init__(self, data: MemberPayload, server: Server, state: State):
-        user = state.get_user(data["_id"]["user"])
+    __slots__ = ("_user", "id", "state", "server", "masquerade_name", "masquerade_avatar")
 
-        # due to not having a user payload and only a user object we have to manually add all the attributes instead of calling User.__init__
-        flattern_user(self, user)
-        user._members[server.id] = self
+    def __init__(self, user: User, server: Server, state: State):
+        # user attributes are read from the shared user object so user updates dont have to be copied to every member
+        self._user: User = user
+        self.id: str = user.id
+        self.masquerade_name: Optional[str] = None
+        self.masquerade_avatar: Optional[PartialAsset] = None
 
         self.state: State = state
+        self.server: Server = server
 
-        self.guild_avatar: Asset | None
+    # the member's own data is either held by the member or read from a columnar member store, so subclasses decide how it is stored
 
-        if avatar := data.get("avatar"):
-            self.guild_avatar = Asset(avatar, state)
-        else:
-            self.guild_avatar = None
+    @property
+    @abstractmethod
+    def nickname(self) -> Optional[str]:
+        """Optional[:class:`str`] The nickname of the member if any"""
+        raise NotImplementedError
 
-        roles = [server.get_role(role_id) for role_id in data.get("roles", [])]
-        self.roles: list[Role] = sorted(roles, key=lambda role: role.rank, reverse=True)
+    @nickname.setter
+    @abstractmethod
+    def nickname(self, nickname: Optional[str]) -> None:
+        raise NotImplementedError
 
-        self.server: Server = server
-        self.nickname: str | None = data.get("nickname")
-        self.joined_at: datetime.datetime = parse_timestamp(data["joined_at"])
+    @property
+    @abstractmethod
+    def guild_avatar(self) -> Optional[Asset]:
+        """Optional[:class:`Asset`] The member's guild avatar if any"""
+        raise NotImplementedError
 
-        self.current_timeout: datetime.datetime | None
+    @guild_avatar.setter
+    @abstractmethod
+    def guild_avatar(self, avatar: Optional[Asset]) -> None:
+        raise NotImplementedError
 
-        if current_timeout := data.get("timeout"):
-            self.current_timeout = parse_timestamp(current_timeout)
-        else:
-            self.current_timeout = None
+    @property
+    @abstractmethod
+    def _joined_at(self) -> int:
+        raise NotImplementedError
+
+    @_joined_at.setter
+    @abstractmethod
+    def _joined_at(self, joined_at: int) -> None:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def _timeout(self) -> Optional[int]:
+        raise NotImplementedError
+
+    @_timeout.setter
+    @abstractmethod
+    def _timeout(self, timeout: Optional[int]) -> None:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def _role_bits(self) -> int:
+        raise NotImplementedError
+
+    @_role_bits.setter
+    @abstractmethod
+    def _role_bits(self, bits: int) -> None:
+        raise NotImplementedError
+
+    @property
+    def joined_at(self) -> datetime.datetime:
+        """:class:`datetime.datetime` When the member joined the server"""
+        return epoch_to_datetime(self._joined_at)
+
+    @joined_at.setter
+    def joined_at(self, joined_at: datetime.datetime) -> None:
+        self._joined_at = (joined_at - EPOCH) // MICROSECOND
+
+    @property
+    def current_timeout(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`] When the member's timeout ends, if they have been timed out"""
+        if (timeout := self._timeout) is None:
+            return None
+
+        return epoch_to_datetime(timeout)
+
+    @current_timeout.setter
+    def current_timeout(self, timeout: Optional[datetime.datetime]) -> None:
+        self._timeout = None if timeout is None else (timeout - EPOCH) // MICROSECOND
+
+    @property
+    def roles(self) -> list[Role]:
+        """list[:class:`Role`] The roles of the member, ordered by the role's rank in decending order"""
+        return self.server._roles_from_bits(self._role_bits)
+
+    @roles.setter
+    def roles(self, roles: list[Role]) -> None:
+        bits = 0
+
+        for role in roles:
+            bits |= role._bit
+
+        if self._is_cached():
+            self.server._index_member_roles(self.id, self._role_bits, bits)
+
+        self._role_bits = bits
+
+    def _is_cached(self) -> bool:
+        return self.server._members.get(self.id) is self
+
+    @property
+    def top_role(self) -> Optional[Role]:
+        """Optional[:class:`Role`] The member's highest role, which is the role with the lowest rank"""
+        for role in reversed(self.server._role_order):
+            if self._role_bits & role._bit:
+                return role
+
+        return None
 
     @property
     def avatar(self) -> Optional[Asset]:
@@ -102,11 +199,10 @@ class Member(User):
             self.guild_avatar = Asset(avatar, self.state)
 
         if roles is not None:
-            member_roles = [self.server.get_role(role_id) for role_id in roles]
-            self.roles = sorted(member_roles, key=lambda role: role.rank, reverse=True)
+            self._role_bits = self.server._role_bits(roles)
 
         if timeout is not None:
-            self.current_timeout = parse_timestamp(timeout)
+            self._timeout = parse_epoch(timeout)
 
     async def kick(self) -> None:
         """Kicks the member from the server"""
@@ -222,9 +318,10 @@ class Member(User):
         :class:`bool`
             Whether or not they have the permissions
         """
-        calculated_perms = self.get_permissions()
+        required, forbidden = permission_masks(permissions)
+        value = calculate_permission_value(self, self.server)
 
-        return all([getattr(calculated_perms, key, False) == value for key, value in permissions.items()])
+        return (value & required) == required and not value & forbidden
 
     def has_channel_permissions(self, channel: Channel, **permissions: bool) -> bool:
         """Computes if the member has the specified permissions, taking into account the channel as well
@@ -241,6 +338,51 @@ class Member(User):
         :class:`bool`
             Whether or not they have the permissions
         """
-        calculated_perms = self.get_channel_permissions(channel)
+        required, forbidden = permission_masks(permissions)
+        value = calculate_permission_value(self, channel)
+
+        return (value & required) == required and not value & forbidden
+
+for _name in User.__flattern_attributes__:
+    # the id is kept on the member for speed and masquerades are per message so they stay on the member
+    if _name not in ("id", "masquerade_name", "masquerade_avatar"):
+        setattr(Member, _name, _UserAttribute(_name))
+
+class StoredMember(Member):
+    """A :class:`Member` which holds its own data, servers store these unless they use a :class:`ColumnarMemberStore`"""
+    __slots__ = ("nickname", "guild_avatar", "_joined_at", "_timeout", "_role_bits")
+
+    def __init__(self, data: Union[MemberPayload, MemberStruct], server: Server, state: State):
+        if isinstance(data, dict):
+            user_id = data["_id"]["user"]
+            avatar = data.get("avatar")
+            roles = data.get("roles", [])
+            nickname = data.get("nickname")
+            joined_at = data["joined_at"]
+            current_timeout = data.get("timeout")
+        else:
+            # typed payloads from revolt.structs are read by attribute which is cheaper than the dict lookups
+            user_id = data._id.user
+            avatar = data.avatar
+            roles = data.roles
+            nickname = data.nickname
+            joined_at = data.joined_at
+            current_timeout = data.timeout
+
+        super().__init__(state.get_user(user_id), server, state)
+
+        if avatar:
+            self.guild_avatar = Asset(avatar, state)
+        else:
+            self.guild_avatar = None
 
-        return all([getattr(calculated_perms, key, False) == value for key, value in permissions.items()])
+        self._role_bits = server._role_bits(roles)
+        self.nickname = nickname
+
+        # times are kept as microseconds since the epoch and only turned into datetimes when accessed
+        self._joined_at = parse_epoch(joined_at)
+
+        if current_timeout:
+            self._timeout = parse_epoch(current_timeout)
+        else:
+            self._timeout = None
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import MutableMapping
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Union
+
+from .asset import Asset
+from .member import Member, StoredMember
+from .user import User
+from .utils import parse_epoch
+
+if TYPE_CHECKING:
+    from .server import Server
+    from .types import Member as MemberPayload
+    from .structs import Member as MemberStruct
+
+__all__ = ("ColumnarMemberStore",)
+
+class ColumnarMember(Member):
+    """A :class:`Member` which reads its data from a :class:`ColumnarMemberStore` instead of holding it
+
+    These are created when a member is looked up and are not kept by the store, two lookups of the same member give two objects which compare equal.
+    """
+    __slots__ = ("_store",)
+
+    def __init__(self, store: ColumnarMemberStore, user: User):
+        super().__init__(user, store.server, store.server.state)
+        self._store: ColumnarMemberStore = store
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ColumnarMember):
+            return self.id == other.id and self._store is other._store
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.id, id(self._store)))
+
+    def __copy__(self) -> Member:
+        return self._store._snapshot(self)
+
+    def _is_cached(self) -> bool:
+        return self.id in self._store._rows
+
+    @property
+    def nickname(self) -> Optional[str]:
+        return self._store._nicknames.get(self.id)
+
+    @nickname.setter
+    def nickname(self, nickname: Optional[str]) -> None:
+        self._store._set_side(self._store._nicknames, self.id, nickname)
+
+    @property
+    def guild_avatar(self) -> Optional[Asset]:
+        return self._store._avatars.get(self.id)
+
+    @guild_avatar.setter
+    def guild_avatar(self, avatar: Optional[Asset]) -> None:
+        self._store._set_side(self._store._avatars, self.id, avatar)
+
+    @property
+    def _timeout(self) -> Optional[int]:
+        return self._store._timeouts.get(self.id)
+
+    @_timeout.setter
+    def _timeout(self, timeout: Optional[int]) -> None:
+        self._store._set_side(self._store._timeouts, self.id, timeout)
+
+    @property
+    def _joined_at(self) -> int:
+        return self._store._joined_at[self._store._rows[self.id]]
+
+    @_joined_at.setter
+    def _joined_at(self, joined_at: int) -> None:
+        self._store._joined_at[self._store._rows[self.id]] = joined_at
+
+    @property
+    def _role_bits(self) -> int:
+        return self._store._role_bits[self._store._rows[self.id]]
+
+    @_role_bits.setter
+    def _role_bits(self, bits: int) -> None:
+        self._store._role_bits[self._store._rows[self.id]] = self._store._intern(bits)
+
+class ColumnarMemberStore(MutableMapping[str, Member]):
+    """Stores a server's members as parallel columns rather than as one object per member
+
+    Each member takes a row in the dense columns, the join time as an int and the role bitset, uncommon values such as nicknames,
+    server avatars and timeouts are kept in side tables keyed by member id. Looking up a member gives a :class:`ColumnarMember` view over its row.
+
+    Parameters
+    -----------
+    server: :class:`Server`
+        The server the members belong to
+    """
+    __slots__ = ("server", "_rows", "_ids", "_joined_at", "_role_bits", "_bitsets", "_nicknames", "_avatars", "_timeouts")
+
+    def __init__(self, server: Server):
+        self.server: Server = server
+
+        self._rows: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._joined_at: array[int] = array("q")
+        self._role_bits: list[int] = []
+        self._bitsets: dict[int, int] = {}  # most members share a few role combinations, this lets them share the int objects too
+
+        self._nicknames: dict[str, str] = {}
+        self._avatars: dict[str, Asset] = {}
+        self._timeouts: dict[str, int] = {}
+
+    def _intern(self, bits: int) -> int:
+        return self._bitsets.setdefault(bits, bits)
+
+    @staticmethod
+    def _set_side(table: dict[str, Any], member_id: str, value: Any) -> None:
+        if value is None:
+            table.pop(member_id, None)
+        else:
+            table[member_id] = value
+
+    def _append(self, member_id: str, joined_at: int, role_bits: int) -> None:
+        # the user is read from the state when the member is looked up so it is never a stale copy, it still has to be cached already
+        self.server.state.get_user(member_id)
+
+        if member_id in self._rows:
+            row = self._rows[member_id]
+            self._joined_at[row] = joined_at
+            self._role_bits[row] = self._intern(role_bits)
+            return
+
+        self._rows[member_id] = len(self._ids)
+        self._ids.append(member_id)
+        self._joined_at.append(joined_at)
+        self._role_bits.append(self._intern(role_bits))
+
+    def add(self, payload: Union[MemberPayload, MemberStruct]) -> Member:
+        """Stores a member from its payload without building a full :class:`Member` first"""
+        if isinstance(payload, dict):
+            member_id = payload["_id"]["user"]
+            joined_at = payload["joined_at"]
+            roles = payload.get("roles", [])
+            nickname = payload.get("nickname")
+            avatar = payload.get("avatar")
+            timeout = payload.get("timeout")
+        else:
+            member_id = payload._id.user
+            joined_at = payload.joined_at
+            roles = payload.roles
+            nickname = payload.nickname
+            avatar = payload.avatar
+            timeout = payload.timeout
+
+        state = self.server.state
+
+        self._append(member_id, parse_epoch(joined_at), self.server._role_bits(roles))
+
+        self._set_side(self._nicknames, member_id, nickname)
+        self._set_side(self._avatars, member_id, Asset(avatar, state) if avatar else None)
+        self._set_side(self._timeouts, member_id, parse_epoch(timeout) if timeout else None)
+
+        return self[member_id]
+
+    def _snapshot(self, member: Member) -> Member:
+        # the data is copied from the member rather than parsed from a payload so only the base member is initialised
+        snapshot = StoredMember.__new__(StoredMember)
+        Member.__init__(snapshot, member._user, member.server, member.state)
+        snapshot.masquerade_name = member.masquerade_name
+        snapshot.masquerade_avatar = member.masquerade_avatar
+
+        snapshot.nickname = member.nickname
+        snapshot.guild_avatar = member.guild_avatar
+        snapshot._timeout = member._timeout
+        snapshot._joined_at = member._joined_at
+        snapshot._role_bits = member._role_bits
+
+        return snapshot
+
+    def __getitem__(self, member_id: str) -> Member:
+        if member_id not in self._rows:
+            raise KeyError(member_id)
+
+        return ColumnarMember(self, self.server.state.get_user(member_id))
+
+    def __setitem__(self, member_id: str, member: Member) -> None:
+        self._append(member_id, member._joined_at, member._role_bits)
+
+        self._set_side(self._nicknames, member_id, member.nickname)
+        self._set_side(self._avatars, member_id, member.guild_avatar)
+        self._set_side(self._timeouts, member_id, member._timeout)
+
+    def __delitem__(self, member_id: str) -> None:
+        row = self._rows.pop(member_id)
+        last = len(self._ids) - 1
+
+        # move the last row into the removed row so the columns stay dense
+        if row != last:
+            moved = self._ids[last]
+            self._rows[moved] = row
+            self._ids[row] = moved
+            self._joined_at[row] = self._joined_at[last]
+            self._role_bits[row] = self._role_bits[last]
+
+        self._ids.pop()
+        self._joined_at.pop()
+        self._role_bits.pop()
+
+        self._nicknames.pop(member_id, None)
+        self._avatars.pop(member_id, None)
+        self._timeouts.pop(member_id, None)
+
+    def pop(self, member_id: str, *default: Any) -> Any:
+        if member_id not in self._rows:
+            if default:
+                return default[0]
+
+            raise KeyError(member_id)
+
+        member = self._snapshot(self[member_id])
+        del self[member_id]
+
+        return member
+
+    def __contains__(self, member_id: object) -> bool:
+        return member_id in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
@@ -13,12 +13,14 @@ if TYPE_CHECKING:
     from .server import Server
     from .state import State
     from .types import Embed as EmbedPayload
+    from .types import File as FilePayload
     from .types import Interactions as InteractionsPayload
     from .types import Masquerade as MasqueradePayload
     from .types import Message as MessagePayload
     from .types import MessageReplyPayload, SystemMessageContent
     from .user import User
     from .member import Member
+    from .structs import Message as MessageStruct
 
 __all__ = (
     "Message",
@@ -43,7 +45,7 @@ class Message(Ulid):
     channel: :class:`Messageable`
         The channel the message was sent in
     author: Union[:class:`Member`, :class:`User`]
-        The author of the message, will be :class:`User` in DMs
+        The author of the message, will be :class:`User` in DMs or if the member is not cached
     edited_at: Optional[:class:`datetime.datetime`]
         The time at which the message was edited, will be None if the message has not been edited
     raw_mentions: list[:class:`str`]
@@ -56,111 +58,205 @@ class Message(Ulid):
         The reactions on the message
     interactions: Optional[:class:`MessageInteractions`]
         The interactions on the message, if any
+
+    .. note:: attachments, embeds, replies, reactions, mentions and edited_at are built from the payload the first time they are accessed.
     """
-    __slots__ = ("state", "id", "content", "attachments", "embeds", "channel", "author", "edited_at", "replies", "reply_ids", "reactions", "interactions")
+    __slots__ = ("state", "id", "content", "system_content", "channel", "server_id", "raw_mentions", "author", "reply_ids", "interactions", "_raw_attachments", "_attachments", "_raw_embeds", "_embeds", "_replies", "_raw_reactions", "_reactions", "_mentions", "_raw_edited", "_edited_at")
+
+    def __init__(self, data: Union[MessagePayload, MessageStruct], state: State):
+        if isinstance(data, dict):
+            message_id = data["_id"]
+            content = data.get("content", "")
+            system = data.get("system")
+            attachments = data.get("attachments", [])
+            embeds = data.get("embeds", [])
+            channel_id = data["channel"]
+            mentions = data.get("mentions", [])
+            author_id = data["author"]
+            masquerade = data.get("masquerade")
+            edited = data.get("edited")
+            replies = data.get("replies", [])
+            reactions = data.get("reactions", {})
+            interactions = data.get("interactions")
+        else:
+            message_id = data._id
+            content = data.content
+            system = data.system
+            attachments = data.attachments
+            embeds = data.embeds
+            channel_id = data.channel
+            mentions = data.mentions
+            author_id = data.author
+            masquerade = data.masquerade
+            edited = data.edited
+            replies = data.replies
+            reactions = data.reactions
+            interactions = data.interactions
 
-    def __init__(self, data: MessagePayload, state: State):
         self.state: State = state
 
-        self.id: str = data["_id"]
-        self.content: str = data.get("content", "")
+        self.id: str = message_id
+        self.content: str = content
 
-        self.system_content: SystemMessageContent | None = data.get("system")
+        self.system_content: SystemMessageContent | None = system
 
-        self.attachments: list[Asset] = [Asset(attachment, state) for attachment in data.get("attachments", [])]
-        self.embeds: list[Embed] = [to_embed(embed, state) for embed in data.get("embeds", [])]
+        # these are only kept as payloads until they are first accessed, most messages never have them read
+        self._raw_attachments: list[FilePayload] = attachments
+        self._attachments: Optional[list[Asset]] = None
+        self._raw_embeds: list[EmbedPayload] = embeds
+        self._embeds: Optional[list[Embed]] = None
 
-        channel = state.get_channel(data["channel"])
+        channel = state.get_channel(channel_id)
         assert isinstance(channel, (TextChannel, GroupDMChannel, DMChannel, SavedMessageChannel))
         self.channel: TextChannel | GroupDMChannel | DMChannel | SavedMessageChannel = channel
 
         self.server_id: str | None = self.channel.server_id
 
-        self.raw_mentions: list[str] = data.get("mentions", [])
+        self.raw_mentions: list[str] = mentions
 
         if self.system_content:
-            author_id: str = self.system_content.get("id", data["author"])
-        else:
-            author_id = data["author"]
+            author_id = self.system_content.get("id", author_id)
 
         if self.server_id:
-            author = state.get_member(self.server_id, author_id)
+            try:
+                author = state.get_member(self.server_id, author_id)
+            except LookupError:
+                # the member isnt cached when the member cache policy is not full, fall back to the user
+                author = state.get_user(author_id)
 
         else:
             author = state.get_user(author_id)
 
         self.author: Member | User = author
 
-        if masquerade := data.get("masquerade"):
+        if masquerade:
             if name := masquerade.get("name"):
                 self.author.masquerade_name = name
 
             if avatar := masquerade.get("avatar"):
                 self.author.masquerade_avatar = PartialAsset(avatar, state)
 
-        if edited_at := data.get("edited"):
-            self.edited_at: Optional[datetime.datetime] = parse_timestamp(edited_at)
-
-        self.replies: list[Message] = []
-        self.reply_ids: list[str] = []
-
-        for reply in data.get("replies", []):
-            try:
-                message = state.get_message(reply)
-                self.replies.append(message)
-            except LookupError:
-                pass
-
-            self.reply_ids.append(reply)
+        self._raw_edited: Optional[Union[str, int]] = edited
+        self._edited_at: Optional[datetime.datetime] = None
 
-        reactions = data.get("reactions", {})
+        self.reply_ids: list[str] = replies
+        self._replies: Optional[list[Message]] = None
 
-        self.reactions: dict[str, list[User]] = {}
+        self._raw_reactions: dict[str, list[str]] = reactions
+        self._reactions: Optional[dict[str, list[User]]] = None
 
-        for emoji, users in reactions.items():
-            self.reactions[emoji] = [self.state.get_user(user_id) for user_id in users]
+        self._mentions: Optional[list[User | Member]] = None
 
         self.interactions: MessageInteractions | None
 
-        if interactions := data.get("interactions"):
+        if interactions:
             self.interactions = MessageInteractions(reactions=interactions.get("reactions"), restrict_reactions=interactions.get("restrict_reactions", False))
         else:
             self.interactions = None
 
-    def _update(self, *, content: Optional[str] = None, embeds: Optional[list[EmbedPayload]] = None, edited: Optional[Union[str, int]] = None):
+    def _update(self, *, content: Optional[str] = None, embeds: Optional[list[EmbedPayload]] = None, edited: Optional[Union[str, int]] = None, mentions: Optional[list[str]] = None):
         if content is not None:
             self.content = content
 
+        if mentions is not None:
+            self.raw_mentions = mentions
+            self._mentions = None
+
         if embeds is not None:
-            self.embeds = [to_embed(embed, self.state) for embed in embeds]
+            self._raw_embeds = embeds
+            self._embeds = None
 
         if edited is not None:
-            self.edited_at = parse_timestamp(edited)
+            self._raw_edited = edited
 
     @property
-    def mentions(self) -> list[User | Member]:
-        """The users or members that where mentioned in the message
+    def attachments(self) -> list[Asset]:
+        """list[:class:`Asset`] The attachments of the message"""
+        if self._attachments is None:
+            self._attachments = [Asset(attachment, self.state) for attachment in self._raw_attachments]
+            self._raw_attachments = []
 
-        Returns: list[Union[:class:`Member`, :class:`User`]]
-        """
+        return self._attachments
 
-        mentions: list[User | Member] = []
+    @property
+    def embeds(self) -> list[Embed]:
+        """list[Union[:class:`WebsiteEmbed`, :class:`ImageEmbed`, :class:`TextEmbed`, :class:`NoneEmbed`]] The embeds of the message"""
+        if self._embeds is None:
+            self._embeds = [to_embed(embed, self.state) for embed in self._raw_embeds]
+            self._raw_embeds = []
 
-        if self.server_id:
-            for mention in self.raw_mentions:
-                try:
-                    self.mentions.append(self.server.get_member(mention))
-                except LookupError:
-                    pass
+        return self._embeds
 
-        else:
-            for mention in self.raw_mentions:
+    @property
+    def edited_at(self) -> Optional[datetime.datetime]:
+        """Optional[:class:`datetime.datetime`] The time at which the message was edited, will be None if the message has not been edited"""
+        if (edited := self._raw_edited) is not None:
+            self._edited_at = parse_timestamp(edited)
+            self._raw_edited = None
+
+        return self._edited_at
+
+    @property
+    def replies(self) -> list[Message]:
+        """list[:class:`Message`] The message's this message has replied to, this only contains the messages which are in the cache"""
+        if self._replies is None:
+            replies: list[Message] = []
+            missing = False
+
+            for reply in self.reply_ids:
                 try:
-                    self.mentions.append(self.state.get_user(mention))
+                    replies.append(self.state.get_message(reply))
                 except LookupError:
-                    pass
+                    missing = True
+
+            # missing messages may be cached later, so the list is only kept once every reply was found
+            if missing:
+                return replies
+
+            self._replies = replies
+
+        return self._replies
 
-        return mentions
+    @property
+    def reactions(self) -> dict[str, list[User]]:
+        """dict[str, list[:class:`User`]] The reactions on the message"""
+        if self._reactions is None:
+            self._reactions = {emoji: [self.state.get_user(user_id) for user_id in users] for emoji, users in self._raw_reactions.items()}
+            self._raw_reactions = {}
+
+        return self._reactions
+
+    @property
+    def mentions(self) -> list[User | Member]:
+        """The users or members that where mentioned in the message
+
+        Returns: list[Union[:class:`Member`, :class:`User`]]
+        """
+        if self._mentions is None:
+            mentions: list[User | Member] = []
+            missing = False
+
+            if self.server_id:
+                for mention in self.raw_mentions:
+                    try:
+                        mentions.append(self.server.get_member(mention))
+                    except LookupError:
+                        missing = True
+
+            else:
+                for mention in self.raw_mentions:
+                    try:
+                        mentions.append(self.state.get_user(mention))
+                    except LookupError:
+                        missing = True
+
+            # like replies, uncached users or members may be cached later
+            if missing:
+                return mentions
+
+            self._mentions = mentions
+
+        return self._mentions
 
     async def edit(self, *, content: Optional[str] = None, embeds: Optional[list[SendableEmbed]] = None) -> None:
         """Edits the message. The bot can only edit its own message
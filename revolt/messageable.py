@@ -97,7 +97,7 @@ class Messageable:
 
             for member in members:
                 if member["_id"]["user"] not in server._members:
-                    server._add_member(member)
+                    self.state.add_member(server.id, member)
 
     async def history(self, *, sort: SortType = SortType.latest, limit: int = 100, before: Optional[str] = None, after: Optional[str] = None, nearby: Optional[str] = None) -> list[Message]:
         """Fetches multiple messages from the channel's history
@@ -11,6 +11,7 @@ __all__ = ("Permissions", "PermissionsOverwrite", "UserPermissions")
 
 class UserPermissions(Flags):
     """Permissions for users"""
+    __slots__ = ()
 
     @Flag
     def access() -> int:
@@ -34,6 +35,7 @@ class UserPermissions(Flags):
 
 class Permissions(Flags):
     """Server permissions for members and roles"""
+    __slots__ = ()
 
     @Flag
     def manage_channel() -> int:
@@ -157,39 +159,34 @@ class Permissions(Flags):
 
     @classmethod
     def default_direct_message(cls) -> Self:
-        return cls.default_view_only() | cls(react=True, manage_channel=True)
+        return cls.default_view_only() | cls(manage_channel=True)
 
 class PermissionsOverwrite:
     """A permissions overwrite in a channel"""
+    __slots__ = ("_allow", "_deny")
 
     def __init__(self, allow: Permissions, deny: Permissions):
         self._allow = allow
         self._deny = deny
 
-        for perm in Permissions.FLAG_NAMES:
-            if getattr(allow, perm):
-                value = True
-            elif getattr(deny, perm):
-                value = False
-            else:
-                value = None
-
-            super().__setattr__(perm, value)
+    def __getattr__(self, key: str) -> Optional[bool]:
+        # each permission is read from the allow and deny pair instead of being stored on the overwrite
+        try:
+            flag = Permissions.FLAG_VALUES[key]
+        except KeyError:
+            raise AttributeError(f"{self.__class__.__name__!r} object has no attribute {key!r}") from None
+
+        if self._allow.value & flag:
+            return True
+        elif self._deny.value & flag:
+            return False
+        else:
+            return None
 
     def __setattr__(self, key: str, value: Any) -> None:
-        if key in Permissions.FLAG_NAMES:
-            if key is True:
-                setattr(self._allow, key, True)
-                super().__setattr__(key, True)
-
-            elif key is False:
-                setattr(self._deny, key, True)
-                super().__setattr__(key, False)
-
-            else:
-                setattr(self._allow, key, False)
-                setattr(self._deny, key, False)
-                super().__setattr__(key, None)
+        if key in Permissions.FLAG_VALUES:
+            setattr(self._allow, key, value is True)
+            setattr(self._deny, key, value is False)
         else:
             super().__setattr__(key, value)
 
@@ -1,43 +1,140 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import TYPE_CHECKING, cast
+import time
+from typing import TYPE_CHECKING, Iterable, Optional, cast
 
 from revolt.enums import ChannelType
 
-from .permissions import Permissions
+from .permissions import Permissions, PermissionsOverwrite
+
+use_numpy: bool
+
+try:
+    import numpy as np
+    use_numpy = True
+except ImportError:
+    use_numpy = False
 
 if TYPE_CHECKING:
+    # numpy is only used once use_numpy is checked, so the checker can treat it as always imported
+    import numpy as np
+    import numpy.typing as npt
+
     from .channel import Channel, DMChannel, GroupDMChannel, ServerChannel
     from .member import Member
     from .server import Server
 
+__all__ = ("PermissionCache", "calculate_permissions", "calculate_permission_value", "calculate_bulk_permissions", "permission_masks")
+
+ALL = Permissions.all().value
+VIEW_ONLY = Permissions.default_view_only().value
+DIRECT_MESSAGE = Permissions.default_direct_message().value
+
+class PermissionCache:
+    """Caches calculated permissions of members in servers and server channels
+
+    Entries are stored per server then per member, so the gateway handlers can drop exactly the entries an event affects.
+    Permissions calculated while a member is timed out expire when the timeout ends.
+    """
+    __slots__ = ("_servers",)
+
+    def __init__(self):
+        self._servers: dict[str, dict[str, dict[str, tuple[int, Optional[float]]]]] = {}
+
+    def get(self, server_id: str, member_id: str, target_id: str) -> Optional[int]:
+        try:
+            value, expires_at = self._servers[server_id][member_id][target_id]
+        except KeyError:
+            return None
+
+        if expires_at is not None and time.time() >= expires_at:
+            del self._servers[server_id][member_id][target_id]
+            return None
+
+        return value
+
+    def set(self, server_id: str, member_id: str, target_id: str, value: int, expires_at: Optional[float]) -> None:
+        self._servers.setdefault(server_id, {}).setdefault(member_id, {})[target_id] = (value, expires_at)
+
+    def invalidate_server(self, server_id: str) -> None:
+        """Drops every entry for the server and its channels"""
+        self._servers.pop(server_id, None)
+
+    def invalidate_member(self, server_id: str, member_id: str) -> None:
+        """Drops every entry for a member of the server"""
+        if members := self._servers.get(server_id):
+            members.pop(member_id, None)
+
+    def invalidate_channel(self, server_id: str, channel_id: str) -> None:
+        """Drops every member's entry for the channel"""
+        for targets in self._servers.get(server_id, {}).values():
+            targets.pop(channel_id, None)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drops every entry for the user in every server"""
+        for members in self._servers.values():
+            members.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._servers.clear()
+
+def _timeout_end(member: Member) -> Optional[float]:
+    # the timeout is kept in microseconds since the epoch so this avoids building datetimes
+    if (timeout := member._timeout) is not None and timeout > time.time() * 1_000_000:
+        return timeout / 1_000_000
+
+    return None
 
 def calculate_permissions(member: Member, target: Server | Channel) -> Permissions:
+    """Calculates the permissions of a member in a server or channel, results for servers and server channels are cached until an event changes them"""
+    return Permissions._from_value(calculate_permission_value(member, target))
+
+def calculate_permission_value(member: Member, target: Server | Channel) -> int:
+    """Same as :func:`calculate_permissions` but returns the raw permission value without building a :class:`Permissions`"""
+    from .server import Server
+
+    if isinstance(target, Server):
+        server_id = target.id
+    elif target.server_id:
+        server_id = target.server_id
+    else:
+        return _calculate_value(member, target)
+
+    cache = member.state.permission_cache
+
+    if (value := cache.get(server_id, member.id, target.id)) is not None:
+        return value
+
+    value = _calculate_value(member, target)
+    cache.set(server_id, member.id, target.id, value, _timeout_end(member))
+
+    return value
+
+def _calculate_value(member: Member, target: Server | Channel) -> int:
     if member.privileged:
-        return Permissions.all()
+        return ALL
 
     from .server import Server
 
     if isinstance(target, Server):
         if target.owner_id == member.id:
-            return Permissions.all()
+            return ALL
 
-        permissions = target.default_permissions
+        value = target.default_permissions.value
 
         for role in member.roles:
-            permissions = (permissions | role.permissions._allow) & (~role.permissions._deny)
+            value = _apply(value, role.permissions)
 
-        if member.current_timeout and member.current_timeout > datetime.now():
-            permissions = permissions & Permissions.default_view_only()
+        if _timeout_end(member) is not None:
+            value &= VIEW_ONLY
 
-        return permissions
+        return value
 
     else:
         channel_type = target.channel_type
 
         if channel_type is ChannelType.saved_messages:
-            return Permissions.all()
+            return ALL
 
         elif channel_type is ChannelType.direct_message:
             target = cast("DMChannel", target)
@@ -45,38 +142,157 @@ def calculate_permissions(member: Member, target: Server | Channel) -> Permissio
             user_permissions = target.recipient.get_permissions()
 
             if user_permissions.send_message:
-                return Permissions.default_direct_message()
+                return DIRECT_MESSAGE
 
             else:
-                return Permissions.default_view_only()
+                return VIEW_ONLY
 
         elif channel_type is ChannelType.group:
             target = cast("GroupDMChannel", target)
 
             if target.owner.id != member.id:
-                return Permissions.default_direct_message()
+                return DIRECT_MESSAGE
             else:
                 if target.permissions.value == 0:
-                    return Permissions.default_direct_message()
+                    return DIRECT_MESSAGE
                 else:
-                    return target.permissions
+                    return target.permissions.value
 
         else:
             target = cast("ServerChannel", target)
             server = target.server
 
             if server.owner_id == member.id:
-                return Permissions.all()
+                return ALL
 
             else:
-                perms = calculate_permissions(member, server)
-                perms = (perms | target.default_permissions._allow) & (~target.default_permissions._deny)
+                value = _apply(calculate_permission_value(member, server), target.default_permissions)
+
+                for role in member.roles:
+                    if overwrite := target.permissions.get(role.id):
+                        value = _apply(value, overwrite)
+
+                if _timeout_end(member) is not None:
+                    value &= VIEW_ONLY
+
+                return value
+
+# below this many distinct role combinations building the arrays costs more than it saves
+NUMPY_THRESHOLD = 64
+
+UINT64_MASK = (1 << 64) - 1
+
+def _apply(value: int, overwrite: PermissionsOverwrite) -> int:
+    return (value | overwrite._allow.value) & ~overwrite._deny.value
+
+def _evaluate(role_bits: int, timed_out: bool, server: Server, channel: Optional[ServerChannel]) -> int:
+    roles = server._roles_from_bits(role_bits)
+    value = server.default_permissions.value
+
+    for role in roles:
+        value = _apply(value, role.permissions)
+
+    if timed_out:
+        value &= VIEW_ONLY
+
+    if channel is not None:
+        value = _apply(value, channel.default_permissions)
+
+        for role in roles:
+            if overwrite := channel.permissions.get(role.id):
+                value = _apply(value, overwrite)
+
+        if timed_out:
+            value &= VIEW_ONLY
+
+    return value
+
+def _apply_array(values: npt.NDArray[np.uint64], overwrite: PermissionsOverwrite) -> npt.NDArray[np.uint64]:
+    # the deny mask is inverted as an int and cut to 64 bits so it fits the array's dtype
+    return (values | np.uint64(overwrite._allow.value)) & np.uint64(~overwrite._deny.value & UINT64_MASK)
+
+def _fold_array(values: npt.NDArray[np.uint64], membership: npt.NDArray[np.bool_], overwrites: list[Optional[PermissionsOverwrite]]) -> npt.NDArray[np.uint64]:
+    for row, overwrite in zip(membership, overwrites):
+        if overwrite is not None:
+            values = np.where(row, _apply_array(values, overwrite), values)
+
+    return values
+
+def _evaluate_arrays(keys: list[tuple[int, bool]], server: Server, channel: Optional[ServerChannel]) -> list[int]:
+    # the server keeps its roles in the same order as member roles, which is the order overwrites are applied in
+    order = server._role_order
+    membership = np.zeros((len(order), len(keys)), dtype=np.bool_)
+
+    for index, role in enumerate(order):
+        membership[index] = [bool(role_bits & role._bit) for role_bits, _ in keys]
+
+    timed_out = np.array([timed_out for _, timed_out in keys], dtype=np.bool_)
+    view_only = np.uint64(VIEW_ONLY)
+
+    values = np.full(len(keys), server.default_permissions.value, dtype=np.uint64)
+    values = _fold_array(values, membership, [role.permissions for role in order])
+    values[timed_out] &= view_only
+
+    if channel is not None:
+        values = _apply_array(values, channel.default_permissions)
+        values = _fold_array(values, membership, [channel.permissions.get(role.id) for role in order])
+        values[timed_out] &= view_only
+
+    return [int(value) for value in values.tolist()]
+
+def calculate_bulk_permissions(members: Iterable[Member], target: Server | ServerChannel) -> dict[str, int]:
+    """Calculates the permissions of many members in a server or server channel at once, this follows the same rules as :func:`calculate_permissions`
+
+    Members with the same roles and timeout state always have the same permissions so each combination is only calculated once,
+    when numpy is installed and there are many combinations they are evaluated together as arrays.
+
+    Returns
+    --------
+    dict[:class:`str`, :class:`int`]
+        The permission value of each member by their id
+    """
+    from .server import Server
+
+    if isinstance(target, Server):
+        server, channel = target, None
+    else:
+        server, channel = target.server, target
+
+    results: dict[str, int] = {}
+    groups: dict[tuple[int, bool], list[str]] = {}
+
+    for member in members:
+        if member.privileged or member.id == server.owner_id:
+            results[member.id] = ALL
+        else:
+            groups.setdefault((member._role_bits, _timeout_end(member) is not None), []).append(member.id)
+
+    keys = list(groups)
+
+    if use_numpy and len(keys) >= NUMPY_THRESHOLD:
+        values = _evaluate_arrays(keys, server, channel)
+    else:
+        values = [_evaluate(role_bits, timed_out, server, channel) for role_bits, timed_out in keys]
+
+    for key, value in zip(keys, values):
+        for member_id in groups[key]:
+            results[member_id] = value
+
+    return results
+
+_compiled_masks: dict[tuple[tuple[str, bool], ...], tuple[int, int]] = {}
+
+def permission_masks(permissions: dict[str, bool]) -> tuple[int, int]:
+    """Turns permission keyword arguments into the mask of permissions which must be set and the mask of permissions which must be unset, compiled masks are reused"""
+    key = tuple(permissions.items())
 
-                for role in server.roles[::-1]:
-                    if overwrite :=target.permissions.get(role.id):
-                        perms = (perms | overwrite._allow) & (~overwrite._deny)
+    try:
+        return _compiled_masks[key]
+    except KeyError:
+        pass
 
-                if member.current_timeout and member.current_timeout > datetime.now():
-                    perms = perms & Permissions(view_channel=True, read_message_history=True)
+    required = Permissions.mask(**permissions)
+    forbidden = Permissions.mask(**{name: not value for name, value in permissions.items()})
+    _compiled_masks[key] = (required, forbidden)
 
-                return perms
+    return required, forbidden
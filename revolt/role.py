@@ -6,6 +6,7 @@ from .permissions import Overwrite, PermissionsOverwrite
 from .utils import Missing, Ulid
 
 if TYPE_CHECKING:
+    from .member import Member
     from .server import Server
     from .state import State
     from .types import Role as RolePayload
@@ -35,7 +36,7 @@ class Role(Ulid):
     channel_permissions: :class:`ChannelPermissions`
         The channel permissions for the role
     """
-    __slots__: tuple[str, ...] = ("id", "name", "colour", "hoist", "rank", "state", "server", "permissions")
+    __slots__: tuple[str, ...] = ("id", "name", "colour", "hoist", "rank", "state", "server", "permissions", "_bit")
 
     def __init__(self, data: RolePayload, role_id: str, server: Server, state: State):
         self.state: State = state
@@ -46,11 +47,17 @@ class Role(Ulid):
         self.rank: int = data["rank"]
         self.server: Server = server
         self.permissions: PermissionsOverwrite = PermissionsOverwrite._from_overwrite(data.get("permissions", {"a": 0, "d": 0}))
+        self._bit: int = 0
 
     @property
     def color(self) -> str | None:
         return self.colour
 
+    @property
+    def members(self) -> list[Member]:
+        """list[:class:`Member`] The cached members with the role"""
+        return self.server.members_with_role(self)
+
     async def set_permissions_overwrite(self, *, permissions: PermissionsOverwrite) -> None:
         """Sets the permissions for a role in a server.
         Parameters
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, cast
+from typing import TYPE_CHECKING, MutableMapping, Optional, Union, cast
 
 from .asset import Asset
 from .category import Category
 from .invite import Invite
 from .permissions import Permissions
+from .permissions_calculator import calculate_bulk_permissions, permission_masks
 from .role import Role
 from .utils import Ulid
 from .channel import Channel, TextChannel, VoiceChannel
-from .member import Member
+from .member import Member, StoredMember
+from .member_store import ColumnarMemberStore
 
 if TYPE_CHECKING:
     from .emoji import Emoji
@@ -22,11 +24,14 @@ if TYPE_CHECKING:
     from .types import SystemMessagesConfig
     from .types import Member as MemberPayload
     from .types import Role as RolePayload
+    from .structs import Server as ServerStruct
+    from .structs import Member as MemberStruct
 
 __all__ = ("Server", "SystemMessages", "ServerBan")
 
 class SystemMessages:
     """Holds all the configuration for the server's system message channels"""
+    __slots__ = ("state", "user_joined_id", "user_left_id", "user_kicked_id", "user_banned_id")
 
     def __init__(self, data: SystemMessagesConfig, state: State):
         self.state: State = state
@@ -123,42 +128,76 @@ class Server(Ulid):
     default_permissions: :class:`Permissions`
         The permissions for the default role
     """
-    __slots__ = ("state", "id", "name", "owner_id", "default_permissions", "_members", "_roles", "_channels", "description", "icon", "banner", "nsfw", "system_messages", "_categories", "_emojis")
+    __slots__ = ("state", "id", "name", "owner_id", "default_permissions", "_members", "_roles", "_role_order", "_next_role_bit", "_roles_by_bit", "_role_members", "_channels", "description", "icon", "banner", "nsfw", "system_messages", "_categories", "_emojis")
+
+    def __init__(self, data: Union[ServerPayload, ServerStruct], state: State):
+        if isinstance(data, dict):
+            server_id = data["_id"]
+            name = data["name"]
+            owner_id = data["owner"]
+            description = data.get("description")
+            nsfw = data.get("nsfw", False)
+            system_messages = data.get("system_messages", cast("SystemMessagesConfig", {}))
+            categories = data.get("categories", [])
+            default_permissions = data["default_permissions"]
+            icon = data.get("icon")
+            banner = data.get("banner")
+            roles = data.get("roles", {})
+            channel_ids = data["channels"]
+        else:
+            server_id = data._id
+            name = data.name
+            owner_id = data.owner
+            description = data.description
+            nsfw = data.nsfw
+            system_messages = data.system_messages
+            categories = data.categories
+            default_permissions = data.default_permissions
+            icon = data.icon
+            banner = data.banner
+            roles = data.roles
+            channel_ids = data.channels
 
-    def __init__(self, data: ServerPayload, state: State):
         self.state: State = state
-        self.id: str = data["_id"]
-        self.name: str = data["name"]
-        self.owner_id: str = data["owner"]
-        self.description: str | None = data.get("description") or None
-        self.nsfw: bool = data.get("nsfw", False)
-        self.system_messages: SystemMessages = SystemMessages(data.get("system_messages", cast("SystemMessagesConfig", {})), state)
-        self._categories: dict[str, Category] = {data["id"]: Category(data, state) for data in data.get("categories", [])}
-        self.default_permissions: Permissions = Permissions(data["default_permissions"])
+        self.id: str = server_id
+        self.name: str = name
+        self.owner_id: str = owner_id
+        self.description: str | None = description or None
+        self.nsfw: bool = nsfw
+        self.system_messages: SystemMessages = SystemMessages(system_messages, state)
+        self._categories: dict[str, Category] = {category["id"]: Category(category, state) for category in categories}
+        self.default_permissions: Permissions = Permissions(default_permissions)
 
         self.icon: Asset | None
 
-        if icon := data.get("icon"):
+        if icon:
             self.icon = Asset(icon, state)
         else:
             self.icon = None
 
         self.banner: Asset | None
 
-        if banner := data.get("banner"):
+        if banner:
             self.banner = Asset(banner, state)
         else:
             self.banner = None
 
-        self._members: dict[str, Member] = {}
-        self._roles: dict[str, Role] = {role_id: Role(role, role_id, self, state) for role_id, role in data.get("roles", {}).items()}
+        self._members: MutableMapping[str, Member] = ColumnarMemberStore(self) if state.columnar_members else {}
+        self._roles: dict[str, Role] = {}
+        self._role_order: list[Role] = []  # sorted by rank in decending order, the same order as member roles
+        self._next_role_bit: int = 1
+        self._roles_by_bit: dict[int, Role] = {}
+        self._role_members: dict[str, set[str]] = {}  # role id to the ids of the cached members with the role
+
+        for role_id, role in roles.items():
+            self._add_role(Role(role, role_id, self, state))
 
         self._channels: dict[str, Channel] = {}
 
         # The api doesnt send us all the channels but sends us all the ids, this is because channels we dont have permissions to see are not sent
         # this causes get_channel to error so we have to first check ourself if its in the cache.
 
-        for channel_id in data["channels"]:
+        for channel_id in channel_ids:
             if channel := state.channels.get(channel_id):
                 self._channels[channel_id] = channel
 
@@ -186,16 +225,76 @@ class Server(Ulid):
         if channels is not None:
             self._channels = {channel_id: self.state.get_channel(channel_id) for channel_id in channels}
 
-    def _add_member(self, payload: MemberPayload) -> Member:
-        member = Member(payload, self, self.state)
-        self._members[member.id] = member
+    def _add_member(self, payload: Union[MemberPayload, MemberStruct]) -> Member:
+        member_id = payload["_id"]["user"] if isinstance(payload, dict) else payload._id.user
+
+        if old := self._members.get(member_id):
+            self._index_member_roles(member_id, old._role_bits, 0)
+
+        if isinstance(self._members, ColumnarMemberStore):
+            member = self._members.add(payload)
+        else:
+            member = StoredMember(payload, self, self.state)
+            self._members[member_id] = member
+
+        self._index_member_roles(member_id, 0, member._role_bits)
 
         return member
 
+    def _add_role(self, role: Role) -> None:
+        # each role gets its own bit for member role bitsets, bits are never reused so deleted roles can be left in the bitsets
+        role._bit = self._next_role_bit
+        self._next_role_bit <<= 1
+
+        self._roles[role.id] = role
+        self._roles_by_bit[role._bit] = role
+        self._sort_roles()
+
+    def _remove_role(self, role_id: str) -> Role:
+        role = self._roles.pop(role_id)
+        self._role_order.remove(role)
+        del self._roles_by_bit[role._bit]
+        self._role_members.pop(role_id, None)
+
+        return role
+
+    def _sort_roles(self) -> None:
+        self._role_order = sorted(self._roles.values(), key=lambda role: role.rank, reverse=True)
+
+    def _role_bits(self, role_ids: list[str]) -> int:
+        bits = 0
+
+        for role_id in role_ids:
+            if role := self._roles.get(role_id):
+                bits |= role._bit
+
+        return bits
+
+    def _roles_from_bits(self, bits: int) -> list[Role]:
+        return [role for role in self._role_order if bits & role._bit]
+
+    def _index_member_roles(self, member_id: str, old_bits: int, new_bits: int) -> None:
+        added = new_bits & ~old_bits
+        removed = old_bits & ~new_bits
+
+        while added:
+            bit = added & -added
+            added ^= bit
+
+            if role := self._roles_by_bit.get(bit):
+                self._role_members.setdefault(role.id, set()).add(member_id)
+
+        while removed:
+            bit = removed & -removed
+            removed ^= bit
+
+            if (role := self._roles_by_bit.get(bit)) and (members := self._role_members.get(role.id)):
+                members.discard(member_id)
+
     @property
     def roles(self) -> list[Role]:
-        """list[:class:`Role`] Gets all roles in the server in decending order"""
-        return list(self._roles.values())
+        """list[:class:`Role`] Gets all roles in the server ordered by their rank in decending order"""
+        return list(self._role_order)
 
     @property
     def members(self) -> list[Member]:
@@ -250,6 +349,49 @@ class Server(Ulid):
         except KeyError:
             raise LookupError from None
 
+    def members_with_role(self, role: Role) -> list[Member]:
+        """Gets every cached member with the role, this only looks at the members with the role rather than every member
+
+        Parameters
+        -----------
+        role: :class:`Role`
+            The role to get the members of
+
+        Returns
+        --------
+        list[:class:`Member`]
+            The members with the role
+        """
+        return [self._members[member_id] for member_id in self._role_members.get(role.id, ())]
+
+    def compute_member_permissions(self) -> dict[str, Permissions]:
+        """Calculates the permissions of every cached member in the server at once, this is much faster than calling :meth:`Member.get_permissions` for each member
+
+        Returns
+        --------
+        dict[:class:`str`, :class:`Permissions`]
+            The permissions of each member by their id
+        """
+        return {member_id: Permissions._from_value(value) for member_id, value in calculate_bulk_permissions(self._members.values(), self).items()}
+
+    def members_with_permission(self, **permissions: bool) -> list[Member]:
+        """Gets every cached member with the specified permissions in the server
+
+        Parameters
+        -----------
+        permissions: :class:`bool`
+            The permissions to check, this also accepted `False` if you need to check if the member does not have the permission
+
+        Returns
+        --------
+        list[:class:`Member`]
+            The members with the permissions
+        """
+        required, forbidden = permission_masks(permissions)
+        values = calculate_bulk_permissions(self._members.values(), self)
+
+        return [self._members[member_id] for member_id, value in values.items() if value & required == required and not value & forbidden]
+
     def get_channel(self, channel_id: str) -> Channel:
         """Gets a channel from the cache
 
@@ -397,9 +539,7 @@ class Server(Ulid):
         :class:`Member`
             The member with the matching id
         """
-        payload = await self.state.http.fetch_member(self.id, member_id)
-
-        return Member(payload, self, self.state)
+        return await self.state.fetch_member(self.id, member_id)
 
     async def fetch_bans(self) -> list[ServerBan]:
         """Fetches all bans in the server
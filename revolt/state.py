@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import TYPE_CHECKING
+import asyncio
+from collections import OrderedDict
+import time
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, TypeVar, Union
 
-from .channel import Channel, channel_factory
+from .channel import Channel, DMChannel, GroupDMChannel, channel_factory
 from .emoji import Emoji
-from .member import Member
+from .enums import MemberCachePolicy, RelationshipType
+from .member import Member, StoredMember
 from .message import Message
+from .permissions_calculator import PermissionCache
 from .server import Server
 from .user import User
 
@@ -19,25 +23,88 @@ if TYPE_CHECKING:
     from .types import Message as MessagePayload
     from .types import Server as ServerPayload
     from .types import User as UserPayload
+    from .structs import Member as MemberStruct
+    from .structs import Message as MessageStruct
+    from .structs import Server as ServerStruct
+    from .structs import User as UserStruct
 
-__all__ = ("State",)
+__all__ = ("State", "MessageCache")
+
+T = TypeVar("T")
+
+class MessageCache:
+    """A size bounded cache of messages, indexed by id so lookups, removals and evictions do not scan the cache.
+
+    Iterating over the cache yields the messages from newest to oldest, when the cache is full the oldest message is evicted. Reading a message does not reorder the cache.
+    """
+    __slots__ = ("max_size", "_messages")
+
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self._messages: OrderedDict[str, Message] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __contains__(self, message_id: object) -> bool:
+        return message_id in self._messages
+
+    def __iter__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def add(self, message: Message) -> None:
+        self._messages[message.id] = message
+        self._messages.move_to_end(message.id)
+
+        if len(self._messages) > self.max_size:
+            self._messages.popitem(last=False)
+
+    def get(self, message_id: str) -> Message:
+        try:
+            return self._messages[message_id]
+        except KeyError:
+            raise LookupError from None
+
+    def pop(self, message_id: str) -> Message:
+        try:
+            return self._messages.pop(message_id)
+        except KeyError:
+            raise LookupError from None
+
+    def remove(self, message: Message) -> None:
+        self.pop(message.id)
+
+    def clear(self) -> None:
+        self._messages.clear()
 
 class State:
-    __slots__ = ("http", "api_info", "max_messages", "users", "channels", "servers", "messages", "global_emojis", "user_id", "me")
+    __slots__ = ("http", "api_info", "max_messages", "users", "channels", "servers", "messages", "global_emojis", "user_id", "me", "member_fetch_timeout", "member_fetch_semaphore", "member_cache", "_member_fetches", "ingest_chunk_size", "ingest_time_budget", "permission_cache", "user_servers", "user_channels", "columnar_members")
 
-    def __init__(self, http: HttpClient, api_info: ApiInfo, max_messages: int):
+    def __init__(self, http: HttpClient, api_info: ApiInfo, max_messages: int, member_fetch_concurrency: int = 10, member_fetch_timeout: Optional[float] = 30, member_cache: MemberCachePolicy = MemberCachePolicy.full, ingest_chunk_size: int = 1000, ingest_time_budget: float = 0.02, columnar_members: bool = False):
         self.http: HttpClient = http
         self.api_info: ApiInfo = api_info
         self.max_messages: int = max_messages
+        self.member_fetch_timeout: Optional[float] = member_fetch_timeout
+        self.member_fetch_semaphore: asyncio.Semaphore = asyncio.Semaphore(member_fetch_concurrency)
+        self.member_cache: MemberCachePolicy = member_cache
+        self._member_fetches: dict[tuple[str, str], asyncio.Task[Member]] = {}
+        self.ingest_chunk_size: int = ingest_chunk_size
+        self.ingest_time_budget: float = ingest_time_budget
+        self.permission_cache: PermissionCache = PermissionCache()
+        self.columnar_members: bool = columnar_members
 
         self.me: User
 
         self.users: dict[str, User] = {}
         self.channels: dict[str, Channel] = {}
         self.servers: dict[str, Server] = {}
-        self.messages: deque[Message] = deque()
+        self.messages: MessageCache = MessageCache(max_messages)
         self.global_emojis: list[Emoji] = []
 
+        # reverse indexes from a user's id to the servers they are a cached member of and the dm and group channels they are in
+        self.user_servers: dict[str, set[str]] = {}
+        self.user_channels: dict[str, set[str]] = {}
+
     def get_user(self, id: str) -> User:
         try:
             return self.users[id]
@@ -60,38 +127,82 @@ class State:
         except KeyError:
             raise LookupError from None
 
-    def add_user(self, payload: UserPayload) -> User:
-
-
+    def add_user(self, payload: Union[UserPayload, UserStruct]) -> User:
         user = User(payload, self)
 
-        if payload.get("relationship") == "User":
+        # members share the cached user, so it is updated in place as replacing it would leave existing members with the old user
+        if (cached := self.users.get(user.id)) is not None:
+            cached._replace(user)
+            user = cached
+        else:
+            self.users[user.id] = user
+
+        if user.relationship is RelationshipType.user:
             self.me = user
 
-        self.users[user.id] = user
         return user
 
-    def add_member(self, server_id: str, payload: MemberPayload) -> Member:
+    def add_member(self, server_id: str, payload: Union[MemberPayload, MemberStruct]) -> Member:
         server = self.get_server(server_id)
 
-        return server._add_member(payload)
+        if self.member_cache is MemberCachePolicy.none:
+            return StoredMember(payload, server, self)
+
+        member = server._add_member(payload)
+        self.user_servers.setdefault(member.id, set()).add(server_id)
+
+        return member
 
     def add_channel(self, payload: ChannelPayload) -> Channel:
         channel = channel_factory(payload, self)
         self.channels[channel.id] = channel
+        self._index_channel(channel)
         return channel
 
-    def add_server(self, payload: ServerPayload) -> Server:
+    def _index_channel(self, channel: Channel) -> None:
+        if isinstance(channel, (DMChannel, GroupDMChannel)):
+            for user_id in channel.recipient_ids:
+                self.user_channels.setdefault(user_id, set()).add(channel.id)
+
+    def _unindex_channel(self, channel: Channel) -> None:
+        if isinstance(channel, (DMChannel, GroupDMChannel)):
+            for user_id in channel.recipient_ids:
+                if channels := self.user_channels.get(user_id):
+                    channels.discard(channel.id)
+
+                    if not channels:
+                        del self.user_channels[user_id]
+
+    def _unindex_member(self, server_id: str, user_id: str) -> None:
+        if servers := self.user_servers.get(user_id):
+            servers.discard(server_id)
+
+            if not servers:
+                del self.user_servers[user_id]
+
+    def _unindex_server(self, server: Server) -> None:
+        for user_id in server._members:
+            self._unindex_member(server.id, user_id)
+
+    def shares_with(self, user_id: str) -> bool:
+        """Whether the user is in a cached server or a dm or group channel with us
+
+        Servers only know all of their members when the member cache policy is full, with any other policy a user is assumed to share a server with us whenever we are in one.
+        """
+        if self.member_cache is not MemberCachePolicy.full and self.servers:
+            return True
+
+        return user_id in self.user_servers or user_id in self.user_channels
+
+    def add_server(self, payload: Union[ServerPayload, ServerStruct]) -> Server:
         server = Server(payload, self)
         self.servers[server.id] = server
         return server
 
-    def add_message(self, payload: MessagePayload) -> Message:
+    def add_message(self, payload: Union[MessagePayload, MessageStruct]) -> Message:
         message = Message(payload, self)
-        if len(self.messages) >= self.max_messages:
-            self.messages.pop()
+        self.messages.add(message)
 
-        self.messages.appendleft(message)
         return message
 
     def add_emoji(self, payload: EmojiPayload) -> Emoji:
@@ -106,21 +217,55 @@ class State:
         return emoji
 
     def get_message(self, message_id: str) -> Message:
-        for msg in self.messages:
-            if msg.id == message_id:
-                return msg
+        return self.messages.get(message_id)
 
-        raise LookupError
+    async def ingest(self, payloads: list[T], add: Callable[[T], object]) -> float:
+        """Calls `add` with every payload, yielding to the event loop every `ingest_chunk_size` payloads or `ingest_time_budget` seconds so large payloads do not block it.
+
+        Returns the time in seconds it took.
+        """
+        chunk_size = self.ingest_chunk_size
+        time_budget = self.ingest_time_budget
+
+        started_at = slice_started_at = time.perf_counter()
+
+        for index, payload in enumerate(payloads, 1):
+            add(payload)
+
+            if index % chunk_size == 0 or time.perf_counter() - slice_started_at >= time_budget:
+                await asyncio.sleep(0)
+                slice_started_at = time.perf_counter()
+
+        return time.perf_counter() - started_at
 
     async def fetch_server_members(self, server_id: str) -> None:
-        data = await self.http.fetch_members(server_id)
+        async with self.member_fetch_semaphore:
+            data = await asyncio.wait_for(self.http.fetch_members(server_id), self.member_fetch_timeout)
+
+        await self.ingest(data["users"], self.add_user)
+        await self.ingest(data["members"], lambda member: self.add_member(server_id, member))
+
+    async def _fetch_member(self, server_id: str, member_id: str) -> Member:
+        payload = await self.http.fetch_member(server_id, member_id)
+
+        if member_id not in self.users:
+            self.add_user(await self.http.fetch_user(member_id))
+
+        if self.member_cache is MemberCachePolicy.lazy:
+            return self.add_member(server_id, payload)
+
+        return StoredMember(payload, self.get_server(server_id), self)
+
+    async def fetch_member(self, server_id: str, member_id: str) -> Member:
+        """Fetches a member, the member is cached when the member cache policy is lazy.
 
-        for user in data["users"]:
-            self.add_user(user)
+        Concurrent fetches for the same member share a single request.
+        """
+        key = (server_id, member_id)
 
-        for member in data["members"]:
-            self.add_member(server_id, member)
+        if (task := self._member_fetches.get(key)) is None:
+            task = self._member_fetches[key] = asyncio.create_task(self._fetch_member(server_id, member_id))
+            task.add_done_callback(lambda _: self._member_fetches.pop(key, None))
 
-    async def fetch_all_server_members(self) -> None:
-        for server_id in self.servers:
-            await self.fetch_server_members(server_id)
+        # shielded so one caller being cancelled does not cancel the request for the others
+        return await asyncio.shield(task)
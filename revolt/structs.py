@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, Union, cast
+
+import msgspec
+
+if TYPE_CHECKING:
+    from .types import Category as CategoryPayload
+    from .types import Embed as EmbedPayload
+    from .types import File as FilePayload
+    from .types import Interactions as InteractionsPayload
+    from .types import Masquerade as MasqueradePayload
+    from .types import Role as RolePayload
+    from .types import SystemMessageContent as SystemMessageContentPayload
+    from .types import SystemMessagesConfig as SystemMessagesConfigPayload
+else:
+    # sub objects are decoded as plain dicts, the checker sees the payload they hold so the models can take either form
+    CategoryPayload = EmbedPayload = FilePayload = InteractionsPayload = MasqueradePayload = RolePayload = dict[str, Any]
+    SystemMessageContentPayload = SystemMessagesConfigPayload = dict[str, Any]
+
+__all__ = (
+    "Payload",
+    "EventPayload",
+    "MemberID",
+    "Member",
+    "UserBot",
+    "Status",
+    "UserRelation",
+    "User",
+    "Server",
+    "Message",
+    "ReadyEventPayload",
+    "MessageEventPayload",
+    "MessageUpdateEventPayload",
+    "MessageDeleteEventPayload",
+    "ChannelUpdateEventPayload",
+    "ChannelDeleteEventPayload",
+    "ChannelStartTypingEventPayload",
+    "ChannelStopTypingEventPayload",
+    "ServerUpdateEventPayload",
+    "ServerDeleteEventPayload",
+    "ServerCreateEventPayload",
+    "ServerMemberUpdateEventPayload",
+    "ServerMemberJoinEventPayload",
+    "ServerMemberLeaveEventPayload",
+    "ServerRoleUpdateEventPayload",
+    "ServerRoleDeleteEventPayload",
+    "UserUpdateEventPayload",
+    "UserRelationshipEventPayload",
+    "MessageReactEventPayload",
+    "MessageUnreactEventPayload",
+    "MessageRemoveReactionEventPayload",
+    "BulkMessageDeleteEventPayload",
+    "EventPayloads"
+)
+
+# msgspec structs mirroring the payloads in revolt.types, this module needs msgspec and is only imported by the typed codecs.
+# fields which the api can leave out default to the value the models would use for them, sub objects which are only built when they are used
+# such as files, embeds, roles and channels are left as dicts
+
+class Payload(msgspec.Struct, omit_defaults=True, gc=False):
+    """Base class for the typed payloads, these can also be read like the dicts they replace
+
+    Fields which were not sent are ``None`` or empty, reading them with ``payload["key"]`` raises :class:`KeyError` like it would for a dict
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        if (value := getattr(self, key, None)) is None:
+            raise KeyError(key)
+
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if (value := getattr(self, key, None)) is None:
+            return default
+
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and getattr(self, key, None) is not None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converts the payload back into the dict the api would have sent"""
+        return msgspec.to_builtins(self)
+
+class EventPayload(Payload, tag_field="type"):
+    """Base class for the typed gateway events"""
+
+    @property
+    def type(self) -> str:
+        return cast(str, self.__struct_config__.tag)  # every event is tagged with its name
+
+class MemberID(Payload):
+    server: str
+    user: str
+
+class Member(Payload):
+    _id: MemberID
+    joined_at: Union[int, str]
+    nickname: Optional[str] = None
+    avatar: Optional[FilePayload] = None
+    roles: list[str] = []
+    timeout: Union[int, str, None] = None
+
+class UserBot(Payload):
+    owner: str
+
+class Status(Payload):
+    text: Optional[str] = None
+    presence: Optional[str] = None
+
+class UserRelation(Payload):
+    _id: str
+    status: str
+
+class User(Payload):
+    _id: str
+    username: str
+    discriminator: str
+    display_name: Optional[str] = None
+    avatar: Optional[FilePayload] = None
+    relations: list[UserRelation] = []
+    badges: int = 0
+    status: Optional[Status] = None
+    relationship: Optional[str] = None
+    online: bool = False
+    flags: int = 0
+    bot: Optional[UserBot] = None
+    privileged: bool = False
+
+class Server(Payload):
+    _id: str
+    owner: str
+    name: str
+    channels: list[str]
+    default_permissions: int
+    nonce: Optional[str] = None
+    description: Optional[str] = None
+    categories: list[CategoryPayload] = []
+    system_messages: SystemMessagesConfigPayload = {}
+    roles: dict[str, RolePayload] = {}
+    icon: Optional[FilePayload] = None
+    banner: Optional[FilePayload] = None
+    nsfw: bool = False
+
+class Message(Payload):
+    _id: str
+    channel: str
+    author: str
+    content: str = ""
+    system: Optional[SystemMessageContentPayload] = None
+    attachments: list[FilePayload] = []
+    embeds: list[EmbedPayload] = []
+    mentions: list[str] = []
+    replies: list[str] = []
+    edited: Union[int, str, None] = None
+    masquerade: Optional[MasqueradePayload] = None
+    interactions: Optional[InteractionsPayload] = None
+    reactions: dict[str, list[str]] = {}
+
+class ReadyEventPayload(EventPayload, tag="Ready"):
+    users: list[User]
+    servers: list[Server]
+    channels: list[dict[str, Any]]
+    members: list[Member]
+    emojis: list[dict[str, Any]] = []
+
+class MessageEventPayload(Message, EventPayload, tag="Message"):
+    pass
+
+class MessageUpdateEventPayload(EventPayload, tag="MessageUpdate"):
+    channel: str
+    id: str
+    data: dict[str, Any]
+
+class MessageDeleteEventPayload(EventPayload, tag="MessageDelete"):
+    channel: str
+    id: str
+
+class ChannelUpdateEventPayload(EventPayload, tag="ChannelUpdate"):
+    id: str
+    data: dict[str, Any]
+    clear: Any = None
+
+class ChannelDeleteEventPayload(EventPayload, tag="ChannelDelete"):
+    id: str
+
+class ChannelStartTypingEventPayload(EventPayload, tag="ChannelStartTyping"):
+    id: str
+    user: str
+
+class ChannelStopTypingEventPayload(EventPayload, tag="ChannelStopTyping"):
+    id: str
+    user: str
+
+class ServerUpdateEventPayload(EventPayload, tag="ServerUpdate"):
+    id: str
+    data: dict[str, Any]
+    clear: Any = None
+
+class ServerDeleteEventPayload(EventPayload, tag="ServerDelete"):
+    id: str
+
+class ServerCreateEventPayload(EventPayload, tag="ServerCreate"):
+    id: str
+    server: Server
+    channels: list[dict[str, Any]]
+
+class ServerMemberUpdateEventPayload(EventPayload, tag="ServerMemberUpdate"):
+    id: MemberID
+    data: dict[str, Any]
+    clear: Any = None
+
+class ServerMemberJoinEventPayload(EventPayload, tag="ServerMemberJoin"):
+    id: str
+    user: str
+
+class ServerMemberLeaveEventPayload(EventPayload, tag="ServerMemberLeave"):
+    id: str
+    user: str
+
+class ServerRoleUpdateEventPayload(EventPayload, tag="ServerRoleUpdate"):
+    id: str
+    role_id: str
+    data: dict[str, Any]
+    clear: Any = None
+
+class ServerRoleDeleteEventPayload(EventPayload, tag="ServerRoleDelete"):
+    id: str
+    role_id: str
+
+class UserUpdateEventPayload(EventPayload, tag="UserUpdate"):
+    id: str
+    data: dict[str, Any]
+    clear: Any = None
+
+class UserRelationshipEventPayload(EventPayload, tag="UserRelationship"):
+    id: str
+    user: str
+    status: str
+
+class MessageReactEventPayload(EventPayload, tag="MessageReact"):
+    id: str
+    channel_id: str
+    user_id: str
+    emoji_id: str
+
+class MessageUnreactEventPayload(EventPayload, tag="MessageUnreact"):
+    id: str
+    channel_id: str
+    user_id: str
+    emoji_id: str
+
+class MessageRemoveReactionEventPayload(EventPayload, tag="MessageRemoveReaction"):
+    id: str
+    channel_id: str
+    emoji_id: str
+
+class BulkMessageDeleteEventPayload(EventPayload, tag="BulkMessageDelete"):
+    channel: str
+    ids: list[str]
+
+# ChannelCreate is left out as its payload is one of the channel types which the channel models read as dicts, it and any event not listed here is decoded as a dict
+EventPayloads = Union[
+    ReadyEventPayload,
+    MessageEventPayload,
+    MessageUpdateEventPayload,
+    MessageDeleteEventPayload,
+    ChannelUpdateEventPayload,
+    ChannelDeleteEventPayload,
+    ChannelStartTypingEventPayload,
+    ChannelStopTypingEventPayload,
+    ServerUpdateEventPayload,
+    ServerDeleteEventPayload,
+    ServerCreateEventPayload,
+    ServerMemberUpdateEventPayload,
+    ServerMemberJoinEventPayload,
+    ServerMemberLeaveEventPayload,
+    ServerRoleUpdateEventPayload,
+    ServerRoleDeleteEventPayload,
+    UserUpdateEventPayload,
+    UserRelationshipEventPayload,
+    MessageReactEventPayload,
+    MessageUnreactEventPayload,
+    MessageRemoveReactionEventPayload,
+    BulkMessageDeleteEventPayload
+]
@@ -66,6 +66,7 @@ class MessageUpdateData(TypedDict):
     content: str
     embeds: list[Embed]
     edited: Union[str, int]
+    mentions: NotRequired[list[str]]
 
 class MessageUpdateEventPayload(BasePayload):
     channel: str
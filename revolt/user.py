@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, NamedTuple, Optional, Union
-from weakref import WeakValueDictionary
 
 from revolt.types.user import UserRelation
 
 from .asset import Asset, PartialAsset
-from .channel import DMChannel, GroupDMChannel, SavedMessageChannel
+from .channel import DMChannel, SavedMessageChannel
 from .enums import PresenceType, RelationshipType
 from .flags import UserBadges
 from .messageable import Messageable
@@ -21,8 +20,9 @@ if TYPE_CHECKING:
     from .types import User as UserPayload
     from .types import UserProfile as UserProfileData
     from .server import Server
+    from .structs import User as UserStruct
 
-__all__ = ("User", "Status", "Relation", "UserProfile")
+__all__ = ("BaseUser", "User", "Status", "Relation", "UserProfile")
 
 class Relation(NamedTuple):
     """A namedtuple representing a relation between the bot and a user"""
@@ -39,95 +39,32 @@ class UserProfile(NamedTuple):
     content: Optional[str]
     background: Optional[Asset]
 
-class User(Messageable, Ulid):
-    """Represents a user
+class BaseUser(Messageable, Ulid):
+    """The base of :class:`User` and :class:`Member`, which share everything that is not stored on the user itself
 
-    Attributes
-    -----------
-    id: :class:`str`
-        The user's id
-    discriminator: :class:`str`
-        The user's discriminator
-    display_name: Optional[:class:`str`]
-        The user's display name if they have one
-    bot: :class:`bool`
-        Whether or not the user is a bot
-    owner_id: Optional[:class:`str`]
-        The bot's owner id if the user is a bot
-    badges: :class:`UserBadges`
-        The users badges
-    online: :class:`bool`
-        Whether or not the user is online
-    flags: :class:`int`
-        The user flags
-    relations: list[:class:`Relation`]
-        A list of the users relations
-    relationship: Optional[:class:`RelationshipType`]
-        The relationship between the user and the bot
-    status: Optional[:class:`Status`]
-        The users status
-    dm_channel: Optional[:class:`DMChannel`]
-        The dm channel between the client and the user, this will only be set if the client has dm'ed the user or :meth:`User.open_dm` was run
-    privileged: :class:`bool`
-        Whether the user is privileged
+    :class:`User` holds the user's data while :class:`Member` reads it from the :class:`User` it belongs to, so neither carries the other's storage.
     """
-    __flattern_attributes__: tuple[str, ...] = ("id", "discriminator", "display_name", "bot", "owner_id", "badges", "online", "flags", "relations", "relationship", "status", "masquerade_avatar", "masquerade_name", "original_name", "original_avatar", "profile", "dm_channel", "privileged")
-    __slots__: tuple[str, ...] = (*__flattern_attributes__, "state", "_members")
-
-    def __init__(self, data: UserPayload, state: State):
-        self.state = state
-        self._members: WeakValueDictionary[str, Member] = WeakValueDictionary()  # we store all member versions of this user to avoid having to check every guild when needing to update.
-        self.id: str = data["_id"]
-        self.discriminator: str = data["discriminator"]
-        self.display_name: str | None = data.get("display_name")
-        self.original_name: str = data["username"]
-        self.dm_channel: DMChannel | SavedMessageChannel | None = None
-
-        bot = data.get("bot")
-
-        self.bot: bool
-        self.owner_id: str | None
-
-        if bot:
-            self.bot = True
-            self.owner_id = bot["owner"]
-        else:
-            self.bot = False
-            self.owner_id = None
-
-        self.badges: UserBadges = UserBadges._from_value(data.get("badges", 0))
-        self.online: bool = data.get("online", False)
-        self.flags: int = data.get("flags", 0)
-        self.privileged: bool = data.get("privileged", False)
-
-        avatar = data.get("avatar")
-        self.original_avatar: Asset | None = Asset(avatar, state) if avatar else None
-
-        relations: list[Relation] = []
-
-        for relation in data.get("relations", []):
-            user = state.get_user(relation["_id"])
-            if user:
-                relations.append(Relation(RelationshipType(relation["status"]), user))
-
-        self.relations: list[Relation] = relations
-
-        relationship = data.get("relationship")
-        self.relationship: RelationshipType | None = RelationshipType(relationship) if relationship else None
-
-        status = data.get("status")
-        self.status: Status | None
-
-        if status:
-            presence = status.get("presence")
-            self.status = Status(status.get("text"), PresenceType(presence) if presence else None) if status else None
-        else:
-            self.status = None
-
-        self.profile: Optional[UserProfile] = None
-
-        self.masquerade_avatar: Optional[PartialAsset] = None
-        self.masquerade_name: Optional[str] = None
+    __slots__ = ()
+
+    state: State
+    id: str
+    discriminator: str
+    display_name: Optional[str]
+    bot: bool
+    owner_id: Optional[str]
+    badges: UserBadges
+    online: bool
+    flags: int
+    relations: list[Relation]
+    relationship: Optional[RelationshipType]
+    status: Optional[Status]
+    masquerade_avatar: Optional[PartialAsset]
+    masquerade_name: Optional[str]
+    original_name: str
+    original_avatar: Optional[Asset]
+    profile: Optional[UserProfile]
+    dm_channel: Union[DMChannel, SavedMessageChannel, None]
+    privileged: bool
 
     def get_permissions(self) -> UserPermissions:
         """Gets the permissions for the user
@@ -148,13 +85,12 @@ class User(Messageable, Ulid):
         elif self.relationship in [RelationshipType.incoming_friend_request, RelationshipType.outgoing_friend_request]:
             permissions.access = True
 
-        for channel in self.state.channels.values():
-            if (isinstance(channel, (GroupDMChannel, DMChannel)) and self.id in channel.recipient_ids) or any(self.id in (m.id for m in server.members) for server in self.state.servers.values()):
-                if self.state.me.bot or self.bot:
-                    permissions.send_message = True
+        if self.state.shares_with(self.id):
+            if self.state.me.bot or self.bot:
+                permissions.send_message = True
 
-                permissions.access = True
-                permissions.view_profile = True
+            permissions.access = True
+            permissions.view_profile = True
 
         return permissions
 
@@ -172,8 +108,10 @@ class User(Messageable, Ulid):
             Whether or not they have the permissions
         """
         perms = self.get_permissions()
+        required = UserPermissions.mask(**permissions)
+        forbidden = UserPermissions.mask(**{name: not value for name, value in permissions.items()})
 
-        return all([getattr(perms, key, False) == value for key, value in permissions.items()])
+        return perms.has_all(required) and not perms.has_any(forbidden)
 
     async def _get_channel_id(self):
         if not self.dm_channel:
@@ -210,86 +148,6 @@ class User(Messageable, Ulid):
         """:class:`str`: Returns a string that allows you to mention the given user."""
         return f"<@{self.id}>"
 
-    def _update(
-        self,
-        *,
-        status: Optional[StatusPayload] = None,
-        profile: Optional[UserProfileData] = None,
-        avatar: Optional[File] = None,
-        online: Optional[bool] = None,
-        display_name: Optional[str] = None,
-        relations: Optional[list[UserRelation]] = None,
-        badges: Optional[int] = None,
-        flags: Optional[int] = None,
-        discriminator: Optional[str] = None,
-        privileged: Optional[bool] = None,
-        username: Optional[str] = None
-    ) -> None:
-        if status is not None:
-            presence = status.get("presence")
-            self.status = Status(status.get("text"), PresenceType(presence) if presence else None)
-
-        if profile is not None:
-            if background_file := profile.get("background"):
-                background = Asset(background_file, self.state)
-            else:
-                background = None
-
-            self.profile = UserProfile(profile.get("content"), background)
-
-        if avatar is not None:
-            self.original_avatar = Asset(avatar, self.state)
-
-        if online is not None:
-            self.online = online
-
-        if display_name is not None:
-            self.display_name = display_name
-
-        if relations is not None:
-            new_relations: list[Relation] = []
-
-            for relation in relations:
-                user = self.state.get_user(relation["_id"])
-                if user:
-                    new_relations.append(Relation(RelationshipType(relation["status"]), user))
-
-            self.relations = new_relations
-
-        if badges is not None:
-            self.badges = UserBadges(badges)
-
-        if flags is not None:
-            self.flags = flags
-
-        if discriminator is not None:
-            self.discriminator = discriminator
-
-        if privileged is not None:
-            self.privileged = privileged
-
-        if username is not None:
-            self.original_name = username
-
-        # update user infomation for all members
-
-        if self.__class__ is User:
-            for member in self._members.values():
-                User._update(
-                    member,
-                    status=status,
-                    profile=profile,
-                    avatar=avatar,
-                    online=online,
-                    display_name=display_name,
-                    relations=relations,
-                    badges=badges,
-                    flags=flags,
-                    discriminator=discriminator,
-                    privileged=privileged,
-                    username=username
-                )
-
     async def default_avatar(self) -> bytes:
         """Returns the default avatar for this user
 
@@ -346,10 +204,7 @@ class User(Messageable, Ulid):
         :class:`LookupError`
 
         """
-        try:
-            return self._members[server.id]
-        except IndexError:
-            raise LookupError from None
+        return server.get_member(self.id)
 
     async def open_dm(self) -> DMChannel | SavedMessageChannel:
         """Opens a dm with the user, if this user is the current user this will return :class:`SavedMessageChannel`
@@ -365,3 +220,182 @@ class User(Messageable, Ulid):
 
         assert self.dm_channel
         return self.dm_channel
+
+class User(BaseUser):
+    """Represents a user, subclasses :class:`BaseUser`
+
+    Attributes
+    -----------
+    id: :class:`str`
+        The user's id
+    discriminator: :class:`str`
+        The user's discriminator
+    display_name: Optional[:class:`str`]
+        The user's display name if they have one
+    bot: :class:`bool`
+        Whether or not the user is a bot
+    owner_id: Optional[:class:`str`]
+        The bot's owner id if the user is a bot
+    badges: :class:`UserBadges`
+        The users badges
+    online: :class:`bool`
+        Whether or not the user is online
+    flags: :class:`int`
+        The user flags
+    relations: list[:class:`Relation`]
+        A list of the users relations
+    relationship: Optional[:class:`RelationshipType`]
+        The relationship between the user and the bot
+    status: Optional[:class:`Status`]
+        The users status
+    dm_channel: Optional[:class:`DMChannel`]
+        The dm channel between the client and the user, this will only be set if the client has dm'ed the user or :meth:`User.open_dm` was run
+    privileged: :class:`bool`
+        Whether the user is privileged
+    """
+    __flattern_attributes__: tuple[str, ...] = ("id", "discriminator", "display_name", "bot", "owner_id", "badges", "online", "flags", "relations", "relationship", "status", "masquerade_avatar", "masquerade_name", "original_name", "original_avatar", "profile", "dm_channel", "privileged")
+    __slots__: tuple[str, ...] = (*__flattern_attributes__, "state")
+
+    def __init__(self, data: Union[UserPayload, UserStruct], state: State):
+        if isinstance(data, dict):
+            user_id = data["_id"]
+            discriminator = data["discriminator"]
+            display_name = data.get("display_name")
+            username = data["username"]
+            bot = data.get("bot")
+            badges = data.get("badges", 0)
+            online = data.get("online", False)
+            flags = data.get("flags", 0)
+            privileged = data.get("privileged", False)
+            avatar = data.get("avatar")
+            relation_payloads = data.get("relations", [])
+            relationship = data.get("relationship")
+            status = data.get("status")
+        else:
+            user_id = data._id
+            discriminator = data.discriminator
+            display_name = data.display_name
+            username = data.username
+            bot = data.bot
+            badges = data.badges
+            online = data.online
+            flags = data.flags
+            privileged = data.privileged
+            avatar = data.avatar
+            relation_payloads = data.relations
+            relationship = data.relationship
+            status = data.status
+
+        self.state = state
+        self.id: str = user_id
+        self.discriminator: str = discriminator
+        self.display_name: str | None = display_name
+        self.original_name: str = username
+        self.dm_channel: DMChannel | SavedMessageChannel | None = None
+
+        self.bot: bool
+        self.owner_id: str | None
+
+        if bot:
+            self.bot = True
+            self.owner_id = bot["owner"]
+        else:
+            self.bot = False
+            self.owner_id = None
+
+        self.badges: UserBadges = UserBadges._from_value(badges)
+        self.online: bool = online
+        self.flags: int = flags
+        self.privileged: bool = privileged
+
+        self.original_avatar: Asset | None = Asset(avatar, state) if avatar else None
+
+        relations: list[Relation] = []
+
+        for relation in relation_payloads:
+            user = state.get_user(relation["_id"])
+            if user:
+                relations.append(Relation(RelationshipType(relation["status"]), user))
+
+        self.relations: list[Relation] = relations
+
+        self.relationship: RelationshipType | None = RelationshipType(relationship) if relationship else None
+
+        self.status: Status | None
+
+        if status:
+            presence = status.get("presence")
+            self.status = Status(status.get("text"), PresenceType(presence) if presence else None) if status else None
+        else:
+            self.status = None
+
+        self.profile: Optional[UserProfile] = None
+
+        self.masquerade_avatar: Optional[PartialAsset] = None
+        self.masquerade_name: Optional[str] = None
+
+    def _replace(self, user: User) -> None:
+        # the dm channel, profile and masquerade are not part of the user payload so they are kept
+        for name in ("discriminator", "display_name", "original_name", "bot", "owner_id", "badges", "online", "flags", "privileged", "original_avatar", "relations", "relationship", "status"):
+            setattr(self, name, getattr(user, name))
+
+    def _update(
+        self,
+        *,
+        status: Optional[StatusPayload] = None,
+        profile: Optional[UserProfileData] = None,
+        avatar: Optional[File] = None,
+        online: Optional[bool] = None,
+        display_name: Optional[str] = None,
+        relations: Optional[list[UserRelation]] = None,
+        badges: Optional[int] = None,
+        flags: Optional[int] = None,
+        discriminator: Optional[str] = None,
+        privileged: Optional[bool] = None,
+        username: Optional[str] = None
+    ) -> None:
+        if status is not None:
+            presence = status.get("presence")
+            self.status = Status(status.get("text"), PresenceType(presence) if presence else None)
+
+        if profile is not None:
+            if background_file := profile.get("background"):
+                background = Asset(background_file, self.state)
+            else:
+                background = None
+
+            self.profile = UserProfile(profile.get("content"), background)
+
+        if avatar is not None:
+            self.original_avatar = Asset(avatar, self.state)
+
+        if online is not None:
+            self.online = online
+
+        if display_name is not None:
+            self.display_name = display_name
+
+        if relations is not None:
+            new_relations: list[Relation] = []
+
+            for relation in relations:
+                user = self.state.get_user(relation["_id"])
+                if user:
+                    new_relations.append(Relation(RelationshipType(relation["status"]), user))
+
+            self.relations = new_relations
+
+        if badges is not None:
+            self.badges = UserBadges(badges)
+
+        if flags is not None:
+            self.flags = flags
+
+        if discriminator is not None:
+            self.discriminator = discriminator
+
+        if privileged is not None:
+            self.privileged = privileged
+
+        if username is not None:
+            self.original_name = username
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import datetime
 import inspect
+import re
 from contextlib import asynccontextmanager
 from operator import attrgetter
 from typing import Any, Callable, Coroutine, Iterable, Literal, TypeVar, Union
@@ -13,6 +14,8 @@ from typing_extensions import ParamSpec
 __all__ = ("_Missing", "Missing", "copy_doc", "maybe_coroutine", "get", "client_session", "parse_timestamp")
 
 class _Missing:
+    __slots__ = ()
+
     def __repr__(self) -> str:
         return "<Missing>"
 
@@ -47,6 +50,8 @@ async def maybe_coroutine(func: Callable[P, Union[R_T, Coroutine[Any, Any, R_T]]
 
 
 class Ulid:
+    __slots__ = ()
+
     id: str
 
     @property
@@ -55,6 +60,8 @@ class Ulid:
 
 class Object(Ulid):
     """Class to mock objects with an id"""
+    __slots__ = ("id",)
+
     def __init__(self, id: str):
         self.id = id
 
@@ -123,8 +130,38 @@ async def client_session():
     finally:
         await session.close()
 
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+# older versions of fromisoformat only accept an offset, not "Z", and exactly 3 or 6 fractional digits
+_TIMESTAMP_FRACTION = re.compile(r"\.(\d+)")
+
+def _normalize_timestamp(timestamp: str) -> str:
+    if timestamp.endswith(("Z", "z")):
+        timestamp = timestamp[:-1] + "+00:00"
+
+    return _TIMESTAMP_FRACTION.sub(lambda match: "." + match[1][:6].ljust(6, "0"), timestamp, count=1)
+
 def parse_timestamp(timestamp: int | str) -> datetime.datetime:
     if isinstance(timestamp, int):
-        return datetime.datetime.fromtimestamp(timestamp / 1000, tz=datetime.timezone.utc)
-    else:
-        return datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z")
+        return EPOCH + datetime.timedelta(milliseconds=timestamp)
+
+    try:
+        parsed = datetime.datetime.fromisoformat(timestamp)
+    except ValueError:
+        parsed = datetime.datetime.fromisoformat(_normalize_timestamp(timestamp))
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+
+    return parsed
+
+def parse_epoch(timestamp: int | str) -> int:
+    """Same as :func:`parse_timestamp` but returns the time as microseconds since the unix epoch, which models store instead of datetimes"""
+    if isinstance(timestamp, int):
+        return timestamp * 1000
+
+    return (parse_timestamp(timestamp) - EPOCH) // MICROSECOND
+
+def epoch_to_datetime(epoch: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=epoch)
@@ -4,12 +4,12 @@ import asyncio
 import logging
 import time
 from copy import copy
-from typing import TYPE_CHECKING, Callable, NamedTuple, cast
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, NamedTuple, Optional, Union, cast
 
+from .codec import Codec, default_gateway_codec
 from .errors import RevoltError
-from . import utils
 from .channel import GroupDMChannel, TextChannel, VoiceChannel
-from .enums import RelationshipType
+from .enums import MemberCachePolicy, RelationshipType
 from .role import Role
 from .types import (BulkMessageDeleteEventPayload, ChannelCreateEventPayload,
                     ChannelDeleteEventPayload, ChannelDeleteTypingEventPayload,
@@ -21,6 +21,7 @@ from .types import (MessageDeleteEventPayload, MessageReactEventPayload,
                     MessageRemoveReactionEventPayload,
                     MessageUnreactEventPayload, MessageUpdateEventPayload)
 from .types import Role as RolePayload
+from .types import User as UserPayload
 from .types import (ServerCreateEventPayload, ServerDeleteEventPayload,
                     ServerMemberJoinEventPayload,
                     ServerMemberLeaveEventPayload,
@@ -32,19 +33,6 @@ from .user import Status, User, UserProfile
 
 import aiohttp
 
-try:
-    import ujson as json
-except ImportError:
-    import json
-
-use_msgpack: bool
-
-try:
-    import msgpack
-    use_msgpack = True
-except ImportError:
-    use_msgpack = False
-
 if TYPE_CHECKING:
     import aiohttp
 
@@ -52,19 +40,130 @@ if TYPE_CHECKING:
     from .types import (AuthenticatePayload, BasePayload, MessageEventPayload,
                         ReadyEventPayload)
     from .message import Message
+    from .structs import Member as MemberStruct
 
 class WSMessage(NamedTuple):
     type: aiohttp.WSMsgType
     data: str | bytes | aiohttp.WSCloseCode
 
-__all__: tuple[str, ...] = ("WebsocketHandler",)
+__all__: tuple[str, ...] = ("WebsocketHandler", "EventDispatcher", "PartitionMetrics")
 
 logger: logging.Logger = logging.getLogger("revolt")
 
+EventHandler = Callable[[Any], Coroutine[Any, Any, None]]
+
+class PartitionMetrics(NamedTuple):
+    """A namedtuple representing the state of one event partition"""
+    depth: int
+    lag: float
+
+class _Partition:
+    __slots__ = ("queue", "task", "lag", "putters")
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue[tuple[float, BasePayload]] = asyncio.Queue(max_size)
+        self.task: asyncio.Task[None] | None = None
+        self.lag: float = 0.0
+        self.putters: int = 0
+
+class EventDispatcher:
+    """Feeds gateway events to a handler through bounded queues, one per partition.
+
+    Events in the same partition are handled one at a time in the order they were received, separate partitions are handled concurrently.
+    When a partition's queue is full :meth:`EventDispatcher.put` waits until there is space, which stops the websocket from being read.
+    A partition's worker exits once its queue is empty and is recreated when the next event for it arrives, :meth:`EventDispatcher.close` stops every worker when the websocket closes.
+
+    Parameters
+    -----------
+    handler: Callable[[:class:`dict`], Coroutine]
+        The coroutine function called for every event
+    max_queue_size: :class:`int`
+        The max amount of events waiting in a single partition
+    """
+    __slots__ = ("handler", "max_queue_size", "_partitions")
+
+    def __init__(self, handler: Callable[[BasePayload], Coroutine[Any, Any, None]], max_queue_size: int):
+        self.handler: Callable[[BasePayload], Coroutine[Any, Any, None]] = handler
+        self.max_queue_size: int = max_queue_size
+        self._partitions: dict[Optional[str], _Partition] = {}
+
+    async def put(self, key: Optional[str], payload: BasePayload) -> None:
+        """Queues an event in a partition, waiting if the partition is full
+
+        Parameters
+        -----------
+        key: Optional[:class:`str`]
+            The partition the event belongs to, ``None`` is the partition for events not tied to a server or channel
+        payload: :class:`dict`
+            The event
+        """
+        partition = self._partitions.get(key)
+
+        if partition is None:
+            partition = self._partitions[key] = _Partition(self.max_queue_size)
+
+        partition.putters += 1
+
+        try:
+            await partition.queue.put((time.perf_counter(), payload))
+        finally:
+            partition.putters -= 1
+
+        if partition.task is None:
+            partition.task = asyncio.create_task(self._worker(key, partition))
+
+    async def _worker(self, key: Optional[str], partition: _Partition) -> None:
+        queue = partition.queue
+
+        # a putter waiting on a full queue will add its event after we make space, so we must not exit until it has
+
+        while not queue.empty() or partition.putters:
+            received_at, payload = await queue.get()
+            partition.lag = time.perf_counter() - received_at
+
+            try:
+                await self.handler(payload)
+            except Exception:
+                logger.exception("Error while handling event %s", payload["type"])
+
+        # nothing can be queued between the empty check and here as there is no await, so no events are lost
+        if self._partitions.get(key) is partition:
+            del self._partitions[key]
+
+    async def close(self) -> None:
+        """Cancels the worker of every partition and waits for them to exit, events still waiting in the partitions are dropped"""
+        tasks = [partition.task for partition in self._partitions.values() if partition.task is not None]
+        self._partitions.clear()
+
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def queue_depth(self) -> int:
+        """:class:`int` The total amount of events waiting to be handled"""
+        return sum(partition.queue.qsize() for partition in self._partitions.values())
+
+    @property
+    def lag(self) -> float:
+        """:class:`float` The longest time in seconds the most recently handled event of any active partition waited in its queue"""
+        return max((partition.lag for partition in self._partitions.values()), default=0.0)
+
+    def metrics(self) -> dict[Optional[str], PartitionMetrics]:
+        """Gets the queue depth and lag of every active partition
+
+        Returns
+        --------
+        dict[Optional[:class:`str`], :class:`PartitionMetrics`]
+            The metrics keyed by partition, events are partitioned by the id of the channel or server they are for
+        """
+        return {key: PartitionMetrics(partition.queue.qsize(), partition.lag) for key, partition in self._partitions.items()}
+
 class WebsocketHandler:
-    __slots__ = ("session", "token", "ws_url", "dispatch", "state", "websocket", "loop", "user", "ready", "server_events")
+    __slots__ = ("session", "token", "ws_url", "dispatch", "state", "websocket", "loop", "user", "ready", "server_events", "dispatcher", "handlers", "ready_timings", "codec", "member_fetch_task")
 
-    def __init__(self, session: aiohttp.ClientSession, token: str, ws_url: str, dispatch: Callable[..., None], state: State):
+    def __init__(self, session: aiohttp.ClientSession, token: str, ws_url: str, dispatch: Callable[..., None], state: State, max_queue_size: int = 1000, codec: Optional[Codec] = None):
         self.session: aiohttp.ClientSession = session
         self.token: str = token
         self.ws_url: str = ws_url
@@ -75,16 +174,73 @@ class WebsocketHandler:
         self.user: User | None = None
         self.ready: asyncio.Event = asyncio.Event()
         self.server_events: dict[str, asyncio.Event] = {}
+        self.ready_timings: dict[str, float] = {}
+        self.member_fetch_task: Optional[asyncio.Task[None]] = None
+        self.codec: Codec = codec or default_gateway_codec()
+        self.dispatcher: EventDispatcher = EventDispatcher(self.handle_event, max_queue_size)
+
+        # maps the lowercased event type to its handler, the event types as revolt sends them are added the first time they are seen
+        self.handlers: dict[str, EventHandler] = {name[7:]: getattr(self, name) for name in dir(self) if name.startswith("handle_") and name != "handle_event"}
+        self.handlers["servermemberleave"] = self.handle_memberleave
+
+    def add_handler(self, event_type: str, handler: EventHandler) -> None:
+        """Registers a handler for a gateway event, replacing the built in handler if there is one
+
+        Parameters
+        -----------
+        event_type: :class:`str`
+            The type of the event as sent by revolt, this is case insensitive
+        handler: Callable[[:class:`dict`], Coroutine]
+            The coroutine function to call with the event's payload
+        """
+        self.remove_handler(event_type)
+        self.handlers[event_type.lower()] = handler
+
+    def remove_handler(self, event_type: str) -> None:
+        """Removes the handler for a gateway event, the event will be ignored afterwards
+
+        Parameters
+        -----------
+        event_type: :class:`str`
+            The type of the event as sent by revolt, this is case insensitive
+        """
+        lowered = event_type.lower()
+
+        for key in [key for key in self.handlers if key.lower() == lowered]:
+            del self.handlers[key]
 
     async def _wait_for_server_ready(self, server_id: str) -> None:
         if event := self.server_events.get(server_id):
             await event.wait()
 
+    async def _fetch_server_members(self, server_id: str) -> None:
+        # the caller must lock the server's events with an entry in `server_events` before this runs
+
+        try:
+            await self.state.fetch_server_members(server_id)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out fetching the members of server %s, its member cache will be incomplete", server_id)
+        except Exception:
+            logger.exception("Failed to fetch the members of server %s, its member cache will be incomplete", server_id)
+        finally:
+            self.server_events.pop(server_id).set()
+
+        if server := self.state.servers.get(server_id):
+            self.dispatch("server_ready", server)
+
+    async def _fetch_all_server_members(self, server_ids: list[str]) -> None:
+        await asyncio.gather(*[self._fetch_server_members(server_id) for server_id in server_ids])
+
+        self.dispatch("ready")
+
     async def send_payload(self, payload: BasePayload) -> None:
-        if use_msgpack:
-            await self.websocket.send_bytes(msgpack.packb(payload))  # type: ignore
+        data = self.codec.dumps(payload)
+
+        if self.codec.format == "msgpack":
+            await self.websocket.send_bytes(cast(bytes, data))
         else:
-            await self.websocket.send_str(json.dumps(payload))
+            # json payloads are sent as text frames even if the codec encodes to bytes
+            await self.websocket.send_str(data.decode() if isinstance(data, bytes) else data)
 
     async def heartbeat(self) -> None:
         while not self.websocket.closed:
@@ -100,17 +256,42 @@ class WebsocketHandler:
 
         await self.send_payload(payload)
 
+    def _get_partition_key(self, payload: Any) -> Optional[str]:
+        event_type = payload["type"]
+
+        if event_type in ("Message", "MessageUpdate", "MessageDelete", "BulkMessageDelete"):
+            return payload["channel"]
+        elif event_type in ("MessageReact", "MessageUnreact", "MessageRemoveReaction"):
+            return payload["channel_id"]
+        elif event_type in ("ChannelUpdate", "ChannelDelete", "ChannelStartTyping", "ChannelStopTyping"):
+            return payload["id"]
+        elif event_type == "ChannelCreate":
+            return payload["_id"]
+        elif event_type == "ServerMemberUpdate":
+            return payload["id"]["server"]
+        elif event_type.startswith("Server"):
+            return payload["id"]
+        else:
+            return None
+
     async def handle_event(self, payload: BasePayload) -> None:
-        event_type = payload["type"].lower()
-        logger.debug("Recieved event %s %s", event_type, payload)
+        event_type = payload["type"]
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Recieved event %s %s", event_type, payload)
 
         try:
-            if event_type not in ["ready", "notfound"]:
-                await self.ready.wait()
+            func = self.handlers[event_type]
+        except KeyError:
+            if (func := self.handlers.get(event_type.lower())) is None:
+                return logger.debug("Unknown event '%s'", event_type)
+
+            self.handlers[event_type] = func
 
-            func = getattr(self, f"handle_{event_type}")
-        except AttributeError:
-            return logger.debug("Unknown event '%s'", event_type)
+        # events without a partition share Ready's queue so they are already handled in order after it,
+        # waiting for ready in that queue would stop Ready itself from being handled
+        if not self.ready.is_set() and event_type not in ("Ready", "NotFound") and self._get_partition_key(payload) is not None:
+            await self.ready.wait()
 
         await func(payload)
 
@@ -121,36 +302,79 @@ class WebsocketHandler:
         raise RevoltError("Invalid token")
 
     async def handle_ready(self, payload: ReadyEventPayload) -> None:
-        for user_payload in payload["users"]:
+        def add_user(user_payload: UserPayload) -> None:
             user = self.state.add_user(user_payload)
 
             if user.relationship == RelationshipType.user:
                 self.user = user
 
-        for channel in payload["channels"]:
-            self.state.add_channel(channel)
+        def add_member(member_payload: Union[MemberPayload, MemberStruct]) -> None:
+            server_id = member_payload["_id"]["server"] if isinstance(member_payload, dict) else member_payload._id.server
+            self.state.add_member(server_id, member_payload)
 
-        for server in payload["servers"]:
-            self.state.add_server(server)
+        # building the cache from a big ready payload can take long enough to starve the heartbeat, so each phase yields to the event loop as it goes
 
+        phases: list[tuple[str, list[Any], Callable[[Any], object]]] = [
+            ("users", payload["users"], add_user),
+            ("channels", payload["channels"], self.state.add_channel),
+            ("servers", payload["servers"], self.state.add_server),
+            ("members", payload["members"], add_member),
+            ("emojis", payload["emojis"], self.state.add_emoji)
+        ]
 
-        for member in payload["members"]:
-            self.state.add_member(member["_id"]["server"], member)
+        for phase, payloads, add in phases:
+            elapsed = self.ready_timings[phase] = await self.state.ingest(payloads, add)
+            logger.debug("Processed %s %s from ready in %.3fs", len(payloads), phase, elapsed)
+
+        # events can be handled as soon as the cache is built, each server's events are held back until its own members are fetched
+
+        if (task := self.member_fetch_task) is not None and not task.done():
+            # a reconnect sent a new ready before the last fetches finished, they would release the new server events early
+            task.cancel()
+
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
 
-        for emoji in payload["emojis"]:
-            emoji = self.state.add_emoji(emoji)
+        if self.state.member_cache is MemberCachePolicy.full:
+            server_ids = list(self.state.servers)
+        else:
+            server_ids = []
 
-        await self.state.fetch_all_server_members()
+        for server_id in server_ids:
+            self.server_events[server_id] = asyncio.Event()
 
         self.ready.set()
-        self.dispatch("ready")
+
+        # the fetches run outside of this partition so events not tied to a server are not held back by them, ready is dispatched once they finish
+        self.member_fetch_task = asyncio.create_task(self._fetch_all_server_members(server_ids))
+
+    async def _fetch_missing_author(self, server_id: str, payload: MessageEventPayload) -> None:
+        if system := payload.get("system"):
+            author_id: str = system.get("id", payload["author"])
+        else:
+            author_id = payload["author"]
+
+        if author_id in self.state.servers[server_id]._members:
+            return
+
+        try:
+            if self.state.member_cache is MemberCachePolicy.lazy:
+                await self.state.fetch_member(server_id, author_id)
+            elif author_id not in self.state.users:
+                self.state.add_user(await self.state.http.fetch_user(author_id))
+        except Exception:
+            logger.exception("Failed to fetch the author %s of message %s", author_id, payload["_id"])
 
     async def handle_message(self, payload: MessageEventPayload) -> None:
         if server := self.state.get_channel(payload["channel"]).server_id:
             await self._wait_for_server_ready(server)
 
-        message = self.state.add_message(cast(MessagePayload, payload))
+            if self.state.member_cache is not MemberCachePolicy.full:
+                await self._fetch_missing_author(server, payload)
 
+        message = self.state.add_message(cast(MessagePayload, payload))
 
         self.dispatch("message", message)
 
@@ -183,7 +407,6 @@ class WebsocketHandler:
 
         self.state.messages.remove(message)
 
-
         self.dispatch("message_delete", message)
 
     async def handle_channelcreate(self, payload: ChannelCreateEventPayload) -> None:
@@ -205,7 +428,12 @@ class WebsocketHandler:
 
         old_channel = copy(channel)
 
+        self.state._unindex_channel(channel)
         channel._update(**payload["data"])
+        self.state._index_channel(channel)
+
+        if server_id:
+            self.state.permission_cache.invalidate_channel(server_id, channel.id)
 
         if clear := payload.get("clear"):
             if clear == "Icon":
@@ -221,8 +449,10 @@ class WebsocketHandler:
 
     async def handle_channeldelete(self, payload: ChannelDeleteEventPayload) -> None:
         channel = self.state.channels.pop(payload["id"])
+        self.state._unindex_channel(channel)
 
         if server_id := channel.server_id:
+            self.state.permission_cache.invalidate_channel(server_id, channel.id)
             await self._wait_for_server_ready(server_id)
 
         self.dispatch("channel_delete", channel)
@@ -255,6 +485,7 @@ class WebsocketHandler:
         old_server = copy(server)
 
         server._update(**payload["data"])
+        self.state.permission_cache.invalidate_server(server.id)
 
         if clear := payload.get("clear"):
             if clear == "Icon":
@@ -271,10 +502,13 @@ class WebsocketHandler:
 
     async def handle_serverdelete(self, payload: ServerDeleteEventPayload) -> None:
         server = self.state.servers.pop(payload["id"])
+        self.state._unindex_server(server)
 
         for channel in server.channels:
             del self.state.channels[channel.id]
 
+        self.state.permission_cache.invalidate_server(server.id)
+
         await self._wait_for_server_ready(server.id)
 
         self.dispatch("server_delete", server)
@@ -285,18 +519,24 @@ class WebsocketHandler:
 
         server = self.state.add_server(payload["server"])
 
-        # lock all server events until we fetch all the members, otherwise the cache will be incomplete
-        self.server_events[server.id] = asyncio.Event()
-        await self.state.fetch_server_members(server.id)
-        self.server_events.pop(server.id).set()
+        if self.state.member_cache is MemberCachePolicy.full:
+            # lock all server events until we fetch all the members, otherwise the cache will be incomplete
+            self.server_events[server.id] = asyncio.Event()
+            await self._fetch_server_members(server.id)
 
         self.dispatch("server_join", server)
 
     async def handle_servermemberupdate(self, payload: ServerMemberUpdateEventPayload) -> None:
         await self._wait_for_server_ready(payload["id"]["server"])
 
-        member = self.state.get_member(payload["id"]["server"], payload["id"]["user"])
+        try:
+            member = self.state.get_member(payload["id"]["server"], payload["id"]["user"])
+        except LookupError:
+            # the member isnt cached when the member cache policy is not full
+            return
+
         old_member = copy(member)
+        old_role_bits = member._role_bits
 
         if clear := payload.get("clear"):
             if clear == "Nickname":
@@ -305,6 +545,8 @@ class WebsocketHandler:
                 member.guild_avatar = None
 
         member._update(**payload["data"])
+        member.server._index_member_roles(member.id, old_role_bits, member._role_bits)
+        self.state.permission_cache.invalidate_member(member.server.id, member.id)
 
         self.dispatch("member_update", old_member, member)
 
@@ -314,7 +556,7 @@ class WebsocketHandler:
             user = await self.state.http.fetch_user(payload["user"])
             self.state.add_user(user)
 
-        member = self.state.add_member(payload["id"], MemberPayload(_id=MemberIDPayload(server=payload["id"], user=payload["user"]), joined_at=int(time.time())))  # revolt doesnt give us the joined at time
+        member = self.state.add_member(payload["id"], MemberPayload(_id=MemberIDPayload(server=payload["id"], user=payload["user"]), joined_at=int(time.time() * 1000)))  # revolt doesnt give us the joined at time
 
         self.dispatch("member_join", member)
 
@@ -322,12 +564,14 @@ class WebsocketHandler:
         await self._wait_for_server_ready(payload["id"])
 
         server = self.state.get_server(payload["id"])
-        member = server._members.pop(payload["user"])
+        self.state.permission_cache.invalidate_member(server.id, payload["user"])
+        self.state._unindex_member(server.id, payload["user"])
 
-        # remove the member from the user
+        # the member isnt cached when the member cache policy is not full
+        if (member := server._members.pop(payload["user"], None)) is None:
+            return
 
-        user = self.state.get_user(payload["user"])
-        user._members.pop(server.id)
+        server._index_member_roles(member.id, member._role_bits, 0)
 
         self.dispatch("member_leave", member)
 
@@ -341,7 +585,7 @@ class WebsocketHandler:
             # the role wasnt found meaning it was just created
 
             role = Role(cast(RolePayload, payload["data"]), payload["role_id"], server, self.state)
-            server._roles[role.id] = role
+            server._add_role(role)
             self.dispatch("role_create", role)
         else:
             old_role = copy(role)
@@ -352,11 +596,17 @@ class WebsocketHandler:
 
             role._update(**payload["data"])
 
+            if "rank" in payload["data"]:
+                server._sort_roles()
+
+            self.state.permission_cache.invalidate_server(server.id)
+
             self.dispatch("role_update", old_role, role)
 
     async def handle_serverroledelete(self, payload: ServerRoleDeleteEventPayload) -> None:
         server = self.state.get_server(payload["id"])
-        role = server._roles.pop(payload["role_id"])
+        role = server._remove_role(payload["role_id"])
+        self.state.permission_cache.invalidate_server(server.id)
 
         await self._wait_for_server_ready(server.id)
 
@@ -383,6 +633,9 @@ class WebsocketHandler:
 
         user._update(**payload["data"])
 
+        if "privileged" in payload["data"]:
+            self.state.permission_cache.invalidate_user(user.id)
+
         self.dispatch("user_update", old_user, user)
 
     async def handle_userrelationship(self, payload: UserRelationshipEventPayload) -> None:
@@ -399,7 +652,7 @@ class WebsocketHandler:
         self.dispatch("raw_reaction_add", payload)
 
         try:
-            message = utils.get(self.state.messages, id=payload["id"])
+            message = self.state.get_message(payload["id"])
         except LookupError:
             return
 
@@ -416,7 +669,7 @@ class WebsocketHandler:
         self.dispatch("raw_reaction_remove", payload)
 
         try:
-            message = utils.get(self.state.messages, id=payload["id"])
+            message = self.state.get_message(payload["id"])
         except LookupError:
             return
 
@@ -432,7 +685,7 @@ class WebsocketHandler:
         self.dispatch("raw_reaction_clear", payload)
 
         try:
-            message = utils.get(self.state.messages, id=payload["id"])
+            message = self.state.get_message(payload["id"])
         except LookupError:
             return
 
@@ -466,31 +719,25 @@ class WebsocketHandler:
             self.dispatch("bulk_message_delete", messages)
 
     async def start(self, reconnect: bool) -> None:
-        if use_msgpack:
-            url = f"{self.ws_url}?format=msgpack"
-        else:
-            url = f"{self.ws_url}?format=json"
+        url = f"{self.ws_url}?format={self.codec.format}"
 
         while True:
             self.websocket = await self.session.ws_connect(url)  # type: ignore
             await self.send_authenticate()
             hb = asyncio.create_task(self.heartbeat())
 
-            async for msg in self.websocket:
-                msg = cast(WSMessage, msg)  # aiohttp doesnt use NamedTuple so the type info is missing
-
-                if use_msgpack:
-                    data = cast(bytes, msg.data)
-
-                    payload = msgpack.unpackb(data)  # type: ignore
-                else:
-                    data = cast(str, msg.data)
+            try:
+                async for msg in self.websocket:
+                    msg = cast(WSMessage, msg)  # aiohttp doesnt use NamedTuple so the type info is missing
 
-                    payload = json.loads(data)
+                    payload = self.codec.loads_event(cast("str | bytes", msg.data))
 
-                self.loop.create_task(self.handle_event(payload))
+                    await self.dispatcher.put(self._get_partition_key(payload), payload)
+            finally:
+                hb.cancel()
 
-            hb.cancel()
+                # events from a closed socket are not handled, a reconnect starts again from a new Ready
+                await self.dispatcher.close()
 
             if not reconnect:
                 return
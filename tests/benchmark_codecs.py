@@ -0,0 +1,67 @@
+"""Measures how fast each installed codec encodes and decodes gateway events
+
+The events are a Ready payload and message events built by the shared test payloads, encoded once with each codec and then decoded as the websocket does.
+Run with ``python -m tests.benchmark_codecs``, codecs whose library is not installed are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any, Callable
+
+from revolt.codec import CODECS, Codec, _MsgspecCodec
+from revolt.errors import RevoltError
+
+from .payloads import make_messages, make_ready
+
+def _best(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+def _codecs() -> list[Codec]:
+    codecs: list[Codec] = []
+
+    for name, codec_type in CODECS.items():
+        try:
+            codecs.append(codec_type())
+        except RevoltError:
+            print(f"{name}: not installed")
+            continue
+
+        if issubclass(codec_type, _MsgspecCodec):
+            codecs.append(codec_type(typed=True))
+
+    return codecs
+
+def main(members: int, messages: int, repeat: int) -> None:
+    ready = make_ready(servers=5, members=members)
+    events: list[dict[str, Any]] = [{"type": "Message", **message} for message in make_messages(ready, messages)]
+
+    print(f"events: a Ready with {len(ready['members'])} members and {len(events)} Message events")
+
+    for codec in _codecs():
+        encoded_ready = codec.dumps(ready)
+        encoded_events = [codec.dumps(event) for event in events]
+
+        encode = _best(lambda: [codec.dumps(event) for event in events], repeat)
+        decode = _best(lambda: [codec.loads_event(event) for event in encoded_events], repeat)
+        decode_ready = _best(lambda: codec.loads_event(encoded_ready), repeat)
+
+        label = f"{codec.name}{' typed' if codec.typed else ''}"
+        print(f"{label:>22}: encode {encode / len(events) * 1e6:.2f}us, decode {decode / len(events) * 1e6:.2f}us per message, Ready {decode_ready * 1e3:.1f}ms ({len(encoded_ready) / 1e6:.2f}MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how fast each installed codec encodes and decodes gateway events")
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    main(args.members, args.messages, args.repeat)
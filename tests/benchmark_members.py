@@ -0,0 +1,88 @@
+"""Measures how fast members are ingested from a GetServerMembers payload, how much memory each one takes and how long their timestamps take to parse
+
+Run with ``python -m tests.benchmark_members`` on two checkouts to compare them, pass ``--columnar`` to store members in a :class:`ColumnarMemberStore`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import gc
+import sys
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any, Callable, cast
+
+from revolt.utils import parse_timestamp
+
+from .payloads import build_state, make_ready, make_server_members
+
+if TYPE_CHECKING:
+    from revolt.http import HttpClient
+    from revolt.state import State
+
+class _FetchedHttp:
+    def __init__(self, payload: dict[str, Any]):
+        self.payload = payload
+
+    async def fetch_members(self, server: str) -> dict[str, Any]:
+        return self.payload
+
+async def _ingest(ready: dict[str, Any], fetched: dict[str, Any], columnar: bool) -> tuple[State, float]:
+    # the ready only has the bot so every member comes from the fetch, as it does for servers the bot joins later
+    state = await build_state({**ready, "users": ready["users"][:1], "members": []}, columnar_members=columnar)
+    state.http = cast("HttpClient", _FetchedHttp(fetched))
+
+    start = time.perf_counter()
+    await state.fetch_server_members(ready["servers"][0]["_id"])
+
+    return state, time.perf_counter() - start
+
+def _time_parsers(fetched: dict[str, Any]) -> None:
+    timestamps: list[str] = [member["joined_at"] for member in fetched["members"]]
+    parsers: list[tuple[str, Callable[[str], datetime.datetime]]] = [
+        ("parse_timestamp", parse_timestamp),
+        # what parse_timestamp used before it switched to fromisoformat
+        ("datetime.strptime", lambda timestamp: datetime.datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S.%f%z"))
+    ]
+
+    for label, parse in parsers:
+        start = time.perf_counter()
+
+        for timestamp in timestamps:
+            parse(timestamp)
+
+        print(f"parse:    {(time.perf_counter() - start) / len(timestamps) * 1e6:.2f}us per joined_at with {label}")
+
+async def main(members: int, repeat: int, columnar: bool) -> None:
+    ready = make_ready(servers=1, members=members)
+    fetched = make_server_members(ready)
+    count = len(fetched["members"])
+
+    best = min([(await _ingest(ready, fetched, columnar))[1] for _ in range(repeat)])
+    print(f"ingest:   {count / best / 1e3:.0f}k members/s ({best * 1e3:.0f}ms for {count} members, best of {repeat})")
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    state, _ = await _ingest(ready, fetched, columnar)
+    gc.collect()
+
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    member = next(iter(state.servers.values())).members[0]
+    print(f"memory:   {size / count:.0f}B per member and user, {sys.getsizeof(member)}B per {type(member).__name__} object")
+
+    _time_parsers(fetched)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how fast members are ingested from a GetServerMembers payload, how much memory each one takes and how long their timestamps take to parse")
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--columnar", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.members, args.repeat, args.columnar))
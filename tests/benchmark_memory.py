@@ -0,0 +1,63 @@
+"""Measures the memory used by the cache after a Ready and a full message cache
+
+Run with ``python -m tests.benchmark_memory`` on two checkouts to compare them, pass ``--columnar`` to store members in a :class:`ColumnarMemberStore`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from collections import Counter
+from typing import Any, cast
+
+from .payloads import build_state, make_messages, make_ready
+from .test_slots import _live_models
+
+async def main(servers: int, members: int, messages: int, columnar: bool) -> None:
+    ready = make_ready(servers=servers, members=members)
+    message_payloads = make_messages(ready, messages)
+
+    gc.collect()
+    tracemalloc.start()
+
+    before = tracemalloc.get_traced_memory()[0]
+    state = await build_state(ready, columnar_members=columnar)
+    gc.collect()
+    after_ready = tracemalloc.get_traced_memory()[0]
+
+    state.messages.max_size = messages
+
+    for payload in message_payloads:
+        state.add_message(cast(Any, payload))
+
+    gc.collect()
+    after_messages = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    member_count = servers * (members + 1)
+    ready_size = after_ready - before
+    message_size = after_messages - after_ready
+
+    print(f"ready:    {ready_size / 1e6:.2f}MB for {servers} servers with {member_count} members, {ready_size / member_count:.0f}B per member")
+    print(f"messages: {message_size / 1e6:.2f}MB for {messages} messages, {message_size / messages:.0f}B per message")
+
+    models = _live_models()
+    counts = Counter(type(model).__name__ for model in models)
+    with_dict = sum(1 for model in models if hasattr(model, "__dict__"))
+
+    print(f"models:   {len(models)} instances, {with_dict} with a __dict__")
+
+    for name, count in counts.most_common(8):
+        print(f"    {name}: {count}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the memory used by the cache after a Ready and a full message cache")
+    parser.add_argument("--servers", type=int, default=5)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--columnar", action="store_true")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.servers, args.members, args.messages, args.columnar))
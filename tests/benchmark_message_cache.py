@@ -0,0 +1,51 @@
+"""Measures how long message events take to handle as the message cache grows
+
+Every event looks up a cached message by id, so with an indexed cache the time per event should not depend on the cache size.
+Run with ``python -m tests.benchmark_message_cache`` on two checkouts to compare them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, cast
+
+from revolt.websocket import WebsocketHandler
+
+from .payloads import API_INFO, build_state, make_messages, make_ready
+
+async def main(sizes: list[int], events: int) -> None:
+    ready = make_ready(servers=1, members=100)
+    user_id = ready["users"][1]["_id"]
+
+    for size in sizes:
+        messages = make_messages(ready, size)
+        state = await build_state(ready, messages)
+
+        handler = WebsocketHandler(cast(Any, None), "token", API_INFO["ws"], lambda *args: None, state)
+        handler.ready.set()
+
+        # messages anywhere in the cache are looked up, not only the newest ones
+        chosen = random.Random(size).choices(messages, k=events)
+
+        start = time.perf_counter()
+
+        for message in chosen:
+            event = {"id": message["_id"], "channel_id": message["channel"], "user_id": user_id, "emoji_id": "emoji"}
+
+            await handler.handle_event(cast(Any, {"type": "MessageReact", **event}))
+            await handler.handle_event(cast(Any, {"type": "MessageUnreact", **event}))
+            await handler.handle_event(cast(Any, {"type": "MessageUpdate", "id": message["_id"], "channel": message["channel"], "data": {"content": "edited"}}))
+
+        elapsed = time.perf_counter() - start
+        print(f"{size:>7} cached messages: {elapsed / (events * 3) * 1e6:.1f}us per event")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how long message events take to handle as the message cache grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10_000, 50_000])
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.sizes, args.events))
@@ -0,0 +1,57 @@
+"""Measures how fast messages are built from history pages, and what reading their sub-objects costs afterwards
+
+Run with ``python -m tests.benchmark_messages`` on two checkouts to compare them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, cast
+
+from revolt import Message
+
+from .payloads import build_state, make_messages, make_ready
+
+def _best(label: str, count: int, func: Callable[[], object], repeat: int) -> None:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{label}: {count / best / 1e3:.0f}k messages/s ({best * 1e3:.1f}ms)")
+
+async def main(pages: int, repeat: int) -> None:
+    ready = make_ready(servers=1, members=1000)
+    state = await build_state(ready)
+
+    # history returns pages of up to 100 messages
+    payloads = [cast(Any, payload) for payload in make_messages(ready, pages * 100)]
+
+    def construct() -> list[Message]:
+        return [Message(payload, state) for payload in payloads]
+
+    def read_common() -> list[object]:
+        return [(message.content, message.author, message.channel) for message in construct()]
+
+    def read_everything() -> list[object]:
+        return [
+            (message.attachments, message.embeds, message.edited_at, message.replies, message.reactions, message.mentions)
+            for message in construct()
+        ]
+
+    _best(f"construct {pages} pages", len(payloads), construct, repeat)
+    _best("construct, read content, author and channel", len(payloads), read_common, repeat)
+    # roughly what every message cost when the sub-objects were built eagerly
+    _best("construct, read every sub-object", len(payloads), read_everything, repeat)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures how fast messages are built from history pages")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pages, args.repeat))
@@ -0,0 +1,62 @@
+"""Measures permission calculation and flag mask checks
+
+Run with ``python -m tests.benchmark_permissions`` on two checkouts to compare them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Callable
+
+from revolt import Permissions, PermissionsOverwrite
+
+from .payloads import build_state, make_ready
+
+def _best(label: str, func: Callable[[], object], repeat: int) -> None:
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    print(f"{label}: {best * 1e3:.1f}ms")
+
+async def main(members: int, repeat: int) -> None:
+    state = await build_state(make_ready(servers=1, members=members, roles=8))
+    server = next(iter(state.servers.values()))
+    channel = server.channels[0]
+    everyone = server.members
+
+    def uncached() -> None:
+        for member in everyone:
+            state.permission_cache.clear()
+            member.has_channel_permissions(channel, send_messages=True, view_channel=True)
+
+    def cached() -> None:
+        for member in everyone:
+            member.has_channel_permissions(channel, send_messages=True, view_channel=True)
+
+    def masks() -> list[bool]:
+        required = Permissions.mask(send_messages=True, view_channel=True)
+        return [member.get_channel_permissions(channel).has_all(required) for member in everyone]
+
+    def objects() -> list[bool]:
+        required = Permissions(send_messages=True, view_channel=True)
+        return [(member.get_channel_permissions(channel) & required) == required for member in everyone]
+
+    _best(f"has_channel_permissions, cache cleared each call x{len(everyone)}", uncached, repeat)
+    _best(f"has_channel_permissions, cached x{len(everyone)}", cached, repeat)
+    _best(f"Permissions.has_all with a compiled mask x{len(everyone)}", masks, repeat)
+    _best(f"Permissions & Permissions == Permissions x{len(everyone)}", objects, repeat)
+    _best(f"PermissionsOverwrite._from_overwrite x{len(everyone)}", lambda: [PermissionsOverwrite._from_overwrite({"a": 123456, "d": 1 << 22}) for _ in everyone], repeat)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures permission calculation and flag mask checks")
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.members, args.repeat))
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional, cast
+
+from revolt.state import State
+from revolt.websocket import WebsocketHandler
+
+if TYPE_CHECKING:
+    from revolt.http import HttpClient
+    from revolt.types import ApiInfo
+
+__all__ = ("make_id", "make_ready", "make_server_members", "make_messages", "build_state")
+
+API_INFO: dict[str, Any] = {"ws": "wss://ws.revolt.chat", "features": {"autumn": {"url": "https://autumn.revolt.chat"}}}
+
+def make_id(index: int, prefix: str = "U") -> str:
+    """Makes a ulid shaped id which is unique for the index and prefix"""
+    return f"{prefix}{index:06d}".ljust(26, "0")
+
+def make_ready(servers: int = 5, members: int = 1000, channels: int = 20, roles: int = 20) -> dict[str, Any]:
+    """Makes a Ready payload where every user is a member of every server"""
+    users: list[dict[str, Any]] = [{"_id": make_id(0), "username": "bot", "discriminator": "0001", "relationship": "User", "bot": {"owner": make_id(1)}}]
+    users += [{"_id": make_id(index), "username": f"user{index}", "discriminator": "0001", "online": index % 2 == 0} for index in range(1, members + 1)]
+
+    channel_payloads: list[dict[str, Any]] = []
+    server_payloads: list[dict[str, Any]] = []
+    member_payloads: list[dict[str, Any]] = []
+
+    for server in range(servers):
+        server_id = make_id(server, "S")
+        channel_ids = [make_id(server * 1000 + channel, "C") for channel in range(channels)]
+        role_ids = [make_id(server * 1000 + role, "R") for role in range(roles)]
+
+        for channel_id in channel_ids:
+            channel_payloads.append({
+                "_id": channel_id,
+                "channel_type": "TextChannel",
+                "server": server_id,
+                "name": "general",
+                "role_permissions": {role_ids[0]: {"a": 1 << 22, "d": 0}}
+            })
+
+        server_payloads.append({
+            "_id": server_id,
+            "owner": make_id(1),
+            "name": f"server {server}",
+            "channels": channel_ids,
+            "default_permissions": (1 << 20) | (1 << 21),
+            "roles": {role_id: {"name": f"role {rank}", "rank": rank, "permissions": {"a": 1 << (rank % 30 + 20), "d": 0}} for rank, role_id in enumerate(role_ids)}
+        })
+
+        for user in range(members + 1):
+            member_payloads.append({
+                "_id": {"server": server_id, "user": make_id(user)},
+                "joined_at": "2022-10-01T12:00:00.123Z",
+                "roles": [role_ids[user % roles]],
+                **({"nickname": f"nick{user}"} if user % 10 == 0 else {})
+            })
+
+    return {"type": "Ready", "users": users, "channels": channel_payloads, "servers": server_payloads, "members": member_payloads, "emojis": []}
+
+def make_server_members(ready: dict[str, Any], server: int = 0) -> dict[str, Any]:
+    """Makes the GetServerMembers payload revolt sends for one of the Ready payload's servers"""
+    server_id = ready["servers"][server]["_id"]
+    members = [member for member in ready["members"] if member["_id"]["server"] == server_id]
+    user_ids = {member["_id"]["user"] for member in members}
+
+    return {"users": [user for user in ready["users"] if user["_id"] in user_ids], "members": members}
+
+def make_messages(ready: dict[str, Any], count: int = 5000) -> list[dict[str, Any]]:
+    """Makes message payloads spread over the channels and users of the Ready payload, some with embeds, attachments and edits"""
+    channel_ids = [channel["_id"] for channel in ready["channels"]]
+    user_ids = [user["_id"] for user in ready["users"][1:]]
+    messages: list[dict[str, Any]] = []
+
+    for index in range(count):
+        message: dict[str, Any] = {
+            "_id": make_id(index, "M"),
+            "channel": channel_ids[index % len(channel_ids)],
+            "author": user_ids[index % len(user_ids)],
+            "content": f"message {index}"
+        }
+
+        if index % 5 == 0:
+            message["embeds"] = [{"type": "Website", "url": "https://revolt.chat", "title": "Revolt"}]
+
+        if index % 7 == 0:
+            message["attachments"] = [{
+                "_id": make_id(index, "A"),
+                "tag": "attachments",
+                "size": 1024,
+                "filename": "image.png",
+                "metadata": {"type": "Image", "width": 64, "height": 64},
+                "content_type": "image/png"
+            }]
+
+        if index % 3 == 0:
+            message["edited"] = "2022-10-01T12:00:00.123Z"
+
+        messages.append(message)
+
+    return messages
+
+class _MemberlessHttp:
+    # the Ready payload already has every member, so fetching them again gives nothing new
+    async def fetch_members(self, server: str) -> dict[str, Any]:
+        return {"users": [], "members": []}
+
+async def build_state(ready: dict[str, Any], messages: Optional[list[dict[str, Any]]] = None, *, columnar_members: bool = False) -> State:
+    """Builds a state from a Ready payload as the websocket would, then adds the messages to its message cache"""
+    messages = messages or []
+    state = State(cast("HttpClient", _MemberlessHttp()), cast("ApiInfo", API_INFO), max(len(messages), 1), columnar_members=columnar_members)
+    handler = WebsocketHandler(cast(Any, None), "token", API_INFO["ws"], lambda *args: None, state)
+
+    await handler.handle_event(cast(Any, ready))
+
+    if handler.member_fetch_task is not None:
+        await handler.member_fetch_task
+
+    for message in messages:
+        state.add_message(cast(Any, message))
+
+    return state
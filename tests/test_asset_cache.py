@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+import pathlib
+
+from revolt.asset_cache import AssetCache
+
+def test_leftover_temporary_files_are_removed(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "attachments_A").write_bytes(b"asset")
+    (tmp_path / "tmpabc123.tmp").write_bytes(b"interrupted")
+
+    cache = AssetCache(tmp_path)
+
+    assert ("attachments", "A") in cache
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["attachments_A"]
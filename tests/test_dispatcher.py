@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+
+from revolt.websocket import EventDispatcher
+
+def test_close_cancels_the_workers() -> None:
+    async def main() -> None:
+        handled: list[str] = []
+        never = asyncio.Event()
+
+        async def handler(payload: Any) -> None:
+            handled.append(payload["type"])
+            await never.wait()
+
+        dispatcher = EventDispatcher(handler, 10)
+
+        for key in ("a", "b", None):
+            await dispatcher.put(key, cast(Any, {"type": f"Event {key}"}))
+
+        await asyncio.sleep(0)
+
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        assert len(tasks) == 3 and len(handled) == 3
+
+        await dispatcher.close()
+
+        assert all(task.cancelled() for task in tasks)
+        assert dispatcher.metrics() == {}
+
+        # the dispatcher is reused after a reconnect
+        never.set()
+        await dispatcher.put("a", cast(Any, {"type": "Event a"}))
+        await asyncio.sleep(0)
+
+        assert handled[-1] == "Event a"
+
+    asyncio.run(main())
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+
+from .payloads import build_state, make_messages, make_ready
+
+def test_reads_do_not_reorder_or_change_eviction() -> None:
+    ready = make_ready(servers=1, members=10, channels=2, roles=2)
+    messages = make_messages(ready, 4)
+    state = asyncio.run(build_state(ready, messages[:3]))
+    state.messages.max_size = 3
+
+    oldest = messages[0]["_id"]
+    state.get_message(oldest)
+
+    assert [message.id for message in state.messages] == [message["_id"] for message in reversed(messages[:3])]
+
+    state.add_message(cast(Any, messages[3]))
+
+    assert oldest not in state.messages
+    assert [message.id for message in state.messages] == [message["_id"] for message in reversed(messages[1:])]
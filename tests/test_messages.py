@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+
+from .payloads import build_state, make_messages, make_ready
+
+def test_replies_and_mentions_resolve_once_cached() -> None:
+    ready = make_ready(servers=1, members=10, channels=1, roles=1)
+    original, reply = make_messages(ready, 2)
+    state = asyncio.run(build_state(ready))
+    member_ids = [user["_id"] for user in ready["users"][1:]]
+
+    message = state.add_message(cast(Any, {**reply, "replies": [original["_id"]], "mentions": [member_ids[0], "unknown"]}))
+
+    assert message.replies == []
+    assert [member.id for member in message.mentions] == [member_ids[0]]
+
+    state.add_message(cast(Any, original))
+
+    assert [replied.id for replied in message.replies] == [original["_id"]]
+
+    message._update(content="edited", mentions=[member_ids[1]])
+
+    assert [member.id for member in message.mentions] == [member_ids[1]]
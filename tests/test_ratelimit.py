@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional, cast
+
+import aiohttp
+import pytest
+from aiohttp import test_utils, web
+
+from revolt.errors import HTTPError
+from revolt.http import HttpClient
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+def _rate_limit_headers(limit: int, remaining: int, reset_after: int, bucket: Optional[str] = None) -> dict[str, str]:
+    headers = {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset-After": str(reset_after)
+    }
+
+    if bucket is not None:
+        headers["X-RateLimit-Bucket"] = bucket
+
+    return headers
+
+def _run(routes: dict[str, Handler], test: Callable[[HttpClient], Awaitable[None]], *, max_retries: int = 5) -> None:
+    async def main() -> None:
+        app = web.Application()
+
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+
+        async with test_utils.TestServer(app) as server, aiohttp.ClientSession() as session:
+            http = HttpClient(session, "token", str(server.make_url("")).rstrip("/"), cast(Any, {}), max_retries=max_retries)
+            await asyncio.wait_for(test(http), 5)
+
+    asyncio.run(main())
+
+def test_requests_queue_until_the_bucket_resets() -> None:
+    window = 0.2
+    arrivals: list[float] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        now = time.monotonic()
+        window_start = next((arrival for arrival in arrivals if now - arrival < window), now)
+        used = sum(1 for arrival in arrivals if arrival >= window_start) + 1
+        arrivals.append(now)
+
+        if used > 2:
+            return web.json_response({"retry_after": 100}, status=429)
+
+        reset_after = int((window - (now - window_start)) * 1000)
+        return web.json_response({}, headers=_rate_limit_headers(2, 2 - used, reset_after))
+
+    async def test(http: HttpClient) -> None:
+        await asyncio.gather(*(http.request("GET", "/limited") for _ in range(3)))
+
+    _run({"/limited": handler}, test)
+
+    # the third request waits for the window to reset instead of being rejected
+    assert len(arrivals) == 3
+    assert arrivals[2] - arrivals[0] >= window * 0.9
+
+def test_429_waits_for_retry_after() -> None:
+    arrivals: list[float] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        arrivals.append(time.monotonic())
+
+        if len(arrivals) == 1:
+            return web.json_response({"retry_after": 150}, status=429, headers=_rate_limit_headers(1, 0, 150))
+
+        return web.json_response({"ok": True}, headers=_rate_limit_headers(1, 0, 150))
+
+    async def test(http: HttpClient) -> None:
+        assert await http.request("GET", "/limited") == {"ok": True}
+
+    _run({"/limited": handler}, test)
+
+    assert len(arrivals) == 2
+    assert arrivals[1] - arrivals[0] >= 0.15 * 0.9
+
+def test_routes_sharing_a_bucket_are_merged() -> None:
+    async def handler(request: web.Request) -> web.Response:
+        return web.json_response({}, headers=_rate_limit_headers(5, 4, 100, "shared"))
+
+    async def test(http: HttpClient) -> None:
+        await http.request("GET", "/b")
+
+        # the first response for /a names a bucket which already exists, requests already queued on /a's own bucket must still go through
+        await asyncio.gather(http.request("GET", "/a"), http.request("GET", "/a"))
+        await http.request("GET", "/a")
+
+        assert http.route_buckets == {"GET /a": "shared", "GET /b": "shared"}
+        assert list(http.buckets) == ["shared"]
+
+    _run({"/a": handler, "/b": handler}, test)
+
+def test_running_out_of_retries_raises() -> None:
+    arrivals: list[float] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        arrivals.append(time.monotonic())
+        return web.json_response({"retry_after": 10}, status=429, headers=_rate_limit_headers(1, 0, 10))
+
+    async def test(http: HttpClient) -> None:
+        with pytest.raises(HTTPError) as error:
+            await http.request("GET", "/limited")
+
+        assert error.value.args == (429,)
+
+    _run({"/limited": handler}, test, max_retries=2)
+
+    assert len(arrivals) == 3
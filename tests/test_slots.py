@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import inspect
+
+import pytest
+
+import revolt
+
+from .payloads import build_state, make_messages, make_ready
+
+# the client is meant to be subclassed so it keeps its __dict__, enums are not models
+UNSLOTTED = (revolt.Client,)
+ENUM_MODULE = "revolt.enums"
+
+def _model_classes() -> list[type]:
+    classes: list[type] = []
+
+    for name in dir(revolt):
+        value = getattr(revolt, name)
+
+        if inspect.isclass(value) and value.__module__.startswith("revolt.") and value.__module__ != ENUM_MODULE and not issubclass(value, (BaseException, *UNSLOTTED)):
+            classes.append(value)
+
+    return classes
+
+@pytest.mark.parametrize("cls", _model_classes(), ids=lambda cls: cls.__name__)
+def test_exported_classes_are_slotted(cls: type) -> None:
+    assert cls.__dictoffset__ == 0, f"{cls.__name__} instances have a __dict__"
+
+# the objects which run the client rather than model revolt's data, and enum members
+INFRASTRUCTURE_MODULES = ("revolt.client", "revolt.state", "revolt.websocket", "revolt.http", ENUM_MODULE)
+
+def _is_model(obj: object) -> bool:
+    module = getattr(type(obj), "__module__", None)
+
+    return (
+        isinstance(module, str)
+        and module.startswith("revolt.")
+        and not module.startswith(INFRASTRUCTURE_MODULES)
+        and not isinstance(obj, type)
+    )
+
+def _live_models() -> list[object]:
+    gc.collect()
+    return [obj for obj in gc.get_objects() if _is_model(obj)]
+
+@pytest.mark.parametrize("columnar_members", [False, True], ids=["members", "columnar_members"])
+def test_cached_models_have_no_dict(columnar_members: bool) -> None:
+    ready = make_ready(servers=2, members=100, channels=5, roles=5)
+    state = asyncio.run(build_state(ready, make_messages(ready, 500), columnar_members=columnar_members))
+
+    # columnar members are only built when looked up, so look every member up while the objects are checked
+    members = [member for server in state.servers.values() for member in server.members]
+
+    models = _live_models()
+
+    assert len(state.messages) == 500
+    assert len(members) == 202
+    assert len(models) > len(members) + len(state.messages)
+    assert sorted({type(model).__name__ for model in models if hasattr(model, "__dict__")}) == []
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import pathlib
+from typing import Any, cast
+
+import aiohttp
+
+from revolt.file import File
+from revolt.http import HttpClient
+
+API_INFO: dict[str, Any] = {"features": {"autumn": {"url": "http://127.0.0.1:1"}}}
+
+def test_cancelled_upload_releases_the_mapped_file(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "image.png"
+    path.write_bytes(b"x" * 1024)
+
+    file = File(str(path), use_mmap=True)
+
+    async def main() -> None:
+        async with aiohttp.ClientSession() as session:
+            http = HttpClient(session, "token", "http://127.0.0.1:1", cast(Any, API_INFO), max_uploads=1)
+
+            # the upload waits for the semaphore after mapping the file, so cancelling it there means the body is never written
+            async with http.upload_semaphore:
+                task = asyncio.ensure_future(http.upload_file(file, "attachments"))
+                await asyncio.sleep(0)
+                task.cancel()
+
+                await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+
+    assert isinstance(file.f, io.IOBase) and file.f.closed
@@ -7,6 +7,18 @@ from typing_extensions import Protocol
 class _FileLike(Protocol):
     def read(self, n: int) -> bytes: ...
 
+class UnpackException(Exception): ...
+
+class FormatError(ValueError, UnpackException): ...
+
+class StackError(ValueError, UnpackException): ...
+
+class ExtraData(ValueError):
+    unpacked: Any
+    extra: bytes
+
+    def __init__(self, unpacked: Any, extra: bytes) -> None: ...
+
 def unpackb(
     packed: bytes,
     file_like: Optional[_FileLike] = ...,